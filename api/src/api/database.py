@@ -1,10 +1,12 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
+from api.metrics import instrument_engine
 from api.settings import settings
 
-# Create an async engine
-engine = create_async_engine(settings.POSTGRES_CONN_STRING, echo=True)
+# Create an async engine, SQL is only logged for the SQL_ECHO_SAMPLE_RATE share of requests (see api.metrics)
+engine = create_async_engine(settings.POSTGRES_CONN_STRING)
+instrument_engine(engine)
 
 # Create a configured "Session" class
 async_session = sessionmaker(
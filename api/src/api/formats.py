@@ -0,0 +1,44 @@
+import io
+import json
+from enum import Enum
+from typing import Dict, List, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class ResponseFormat(str, Enum):
+    json = 'json'
+    columnar = 'columnar'
+    arrow = 'arrow'
+    parquet = 'parquet'
+
+
+media_types = {
+    ResponseFormat.json: 'application/json',
+    ResponseFormat.columnar: 'application/json',
+    ResponseFormat.arrow: 'application/vnd.apache.arrow.stream',
+    ResponseFormat.parquet: 'application/vnd.apache.parquet',
+}
+
+
+def rows_to_columns(rows, column_names: List[str]) -> Dict[str, list]:
+    # Rows straight from a Core select, transposed without building ORM objects
+    columns = list(zip(*rows)) if rows else [() for _ in column_names]
+    return {name: list(values) for name, values in zip(column_names, columns)}
+
+
+def serialize_columns(columns: Dict[str, list], response_format: ResponseFormat) -> Tuple[bytes, str]:
+    if response_format == ResponseFormat.columnar:
+        return json.dumps(columns).encode('utf-8'), media_types[response_format]
+
+    table = pa.table(columns)
+    sink = io.BytesIO()
+    if response_format == ResponseFormat.arrow:
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+    elif response_format == ResponseFormat.parquet:
+        pq.write_table(table, sink)
+    else:
+        raise ValueError(f'{response_format} is not a columnar format')
+    return sink.getvalue(), media_types[response_format]
@@ -0,0 +1,95 @@
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Request
+from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.responses import Response
+
+from api.settings import settings
+
+sql_logger = logging.getLogger('api.sql')
+
+request_latency = Histogram('api_request_duration_seconds', 'Request latency by route',
+                            ['method', 'route', 'status'])
+request_db_queries = Histogram('api_request_db_queries', 'DB queries issued per request', ['route'],
+                               buckets=(0, 1, 2, 3, 5, 10, 25, 50))
+request_db_seconds = Histogram('api_request_db_seconds', 'Time spent in DB queries per request', ['route'])
+serialization_seconds = Histogram('api_serialization_seconds', 'Time spent serializing response bodies',
+                                  ['media_type'])
+
+
+@dataclass
+class RequestStats:
+    db_queries: int = 0
+    db_seconds: float = 0.0
+    echo_sql: bool = False
+
+
+# Mutated in place by the engine hooks, so the per request totals survive the greenlet SQLAlchemy runs queries in
+request_stats: ContextVar[Optional[RequestStats]] = ContextVar('request_stats', default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+    stats = request_stats.get()
+    if stats is not None and stats.echo_sql:
+        sql_logger.info('%s %r', statement, parameters)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    stats = request_stats.get()
+    if stats is not None:
+        stats.db_queries += 1
+        stats.db_seconds += elapsed
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    event.listen(engine.sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine.sync_engine, 'after_cursor_execute', _after_cursor_execute)
+    REGISTRY.register(PoolCollector(engine))
+    if settings.SQL_ECHO_SAMPLE_RATE > 0 and not sql_logger.handlers:
+        # Same effect as echo=True, just for the sampled requests
+        sql_logger.setLevel(logging.INFO)
+        sql_logger.addHandler(logging.StreamHandler())
+
+
+class PoolCollector:
+    # Read from the pool at scrape time rather than tracked on every checkout
+    def __init__(self, engine: AsyncEngine):
+        self.pool = engine.sync_engine.pool
+
+    def collect(self):
+        for name, value in [('size', self.pool.size()), ('checked_out', self.pool.checkedout()),
+                            ('checked_in', self.pool.checkedin()), ('overflow', self.pool.overflow())]:
+            yield GaugeMetricFamily(f'api_db_pool_{name}', f'Connection pool {name.replace("_", " ")}', value=value)
+
+
+async def metrics_middleware(request: Request, call_next):
+    stats = RequestStats(echo_sql=random.random() < settings.SQL_ECHO_SAMPLE_RATE)
+    token = request_stats.set(stats)
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        request_stats.reset(token)
+        # Label by the matched route template, not the raw path, so query strings and ids don't explode cardinality
+        route = request.scope.get('route')
+        route = route.path if route is not None else 'unmatched'
+        request_latency.labels(request.method, route, status).observe(time.perf_counter() - start)
+        request_db_queries.labels(route).observe(stats.db_queries)
+        request_db_seconds.labels(route).observe(stats.db_seconds)
+
+
+def metrics_response() -> Response:
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, Float, String, Integer, Date, Time
+from sqlalchemy import Column, BigInteger, Float, String, Integer, Date, Time, DateTime, Index, text
 # from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import declarative_base
 
@@ -6,6 +6,10 @@ Base = declarative_base()
 
 class WeeklyPredictionBase(Base):
     __tablename__ = 'weekly_predictions_base'
+    __table_args__ = (
+        Index('ix_weekly_predictions_base_position', 'season', 'week', 'position'),
+        Index('ix_weekly_predictions_base_team', 'season', 'week', 'team'),
+    )
 
     week = Column(BigInteger, primary_key=True, nullable=False)
     season = Column(BigInteger, primary_key=True, nullable=False)
@@ -29,50 +33,44 @@ class WeeklyPredictionBase(Base):
     position = Column(String)
 
 
-class WeeklyPredictionStdHalfPPR(Base):
-    __tablename__ = 'weekly_predictions_std_half_ppr'
+class WeeklyFantasyPoints(Base):
+    __tablename__ = 'weekly_fantasy_points'
+    __table_args__ = (
+        Index('ix_weekly_fantasy_points_ranked', 'season', 'week', 'scoring_format', text('fantasy_points DESC'),
+              text('player_id DESC')),
+    )
 
-    season = Column(BigInteger, primary_key=True, nullable=False)
-    week = Column(BigInteger, primary_key=True, nullable=False)
-    player_id = Column(String, primary_key=True, nullable=False)
-
-    fantasy_points = Column(Float)
-
-
-class WeeklyPredictionStdFullPPR(Base):
-    __tablename__ = 'weekly_predictions_std_full_ppr'
-
-    season = Column(BigInteger, primary_key=True, nullable=False)
-    week = Column(BigInteger, primary_key=True, nullable=False)
-    player_id = Column(String, primary_key=True, nullable=False)
-
-    fantasy_points = Column(Float)
-
-
-class WeeklyPredictionDKDFS(Base):
-    __tablename__ = 'weekly_predictions_dk_dfs'
-
-    season = Column(BigInteger, primary_key=True, nullable=False)
-    week = Column(BigInteger, primary_key=True, nullable=False)
-    player_id = Column(String, primary_key=True, nullable=False)
+    season = Column(Integer, primary_key=True, nullable=False)
+    week = Column(Integer, primary_key=True, nullable=False)
+    scoring_format = Column(String, primary_key=True, nullable=False)
+    player_id = Column(String(255), primary_key=True, nullable=False)
 
     fantasy_points = Column(Float)
 
 
 class Schedule(Base):
     __tablename__ = 'schedule'
+    __table_args__ = (
+        Index('ix_schedule_season_week', 'season', 'week'),
+        Index('ix_schedule_gameday', 'gameday'),
+    )
 
     game_id = Column(String, primary_key=True)
     season = Column(Integer, nullable=False)
     week = Column(Integer, nullable=False)
     gameday = Column(Date, nullable=False)
-    gametime = Column(Time, nullable=False)
-    weekdate = Column(String, nullable=False)
+    gametime = Column(Time)
+    weekday = Column(String)
     home_team = Column(String, nullable=False)
     away_team = Column(String, nullable=False)
 
 class PredictionDiff(Base):
     __tablename__ = 'prediction_diffs'
+    __table_args__ = (
+        Index('ix_prediction_diffs_ranked', 'season', 'week', text('fantasy_points DESC'), text('player_id DESC')),
+        Index('ix_prediction_diffs_position', 'season', 'week', 'position', text('fantasy_points DESC'),
+              text('player_id DESC')),
+    )
 
     player_id = Column(String(255), primary_key=True)
     season = Column(Integer, primary_key=True)
@@ -129,4 +127,27 @@ class AccuracyMetric(Base):
     MAE = Column(Float)
     MSE = Column(Float)
     RMSE = Column(Float)
-    R_squared = Column(Float)
\ No newline at end of file
+    R_squared = Column(Float)
+
+
+class CompletedWeek(Base):
+    __tablename__ = 'completed_weeks'
+
+    season = Column(Integer, primary_key=True)
+    week = Column(Integer, primary_key=True)
+    player_count = Column(Integer, nullable=False)
+    computed_at = Column(DateTime(timezone=True), nullable=False)
+    MAE = Column(Float)
+    MSE = Column(Float)
+    RMSE = Column(Float)
+    R_squared = Column(Float)
+
+
+class DataVersion(Base):
+    __tablename__ = 'data_versions'
+
+    table_name = Column(String, primary_key=True)
+    season = Column(Integer, primary_key=True)
+    week = Column(Integer, primary_key=True)
+    version = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)
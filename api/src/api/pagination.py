@@ -0,0 +1,45 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import HTTPException, Query
+from sqlalchemy import tuple_
+
+from api.settings import settings
+
+
+@dataclass
+class PredictionFilters:
+    position: Optional[str] = None
+    team: Optional[str] = None
+    limit: Optional[int] = None
+    after_fantasy_points: Optional[float] = None
+    after_player_id: Optional[str] = None
+
+
+def get_prediction_filters(
+        position: Optional[str] = None,
+        team: Optional[str] = None,
+        limit: Optional[int] = Query(None, ge=1, le=settings.MAX_PAGE_SIZE),
+        after_fantasy_points: Optional[float] = None,
+        after_player_id: Optional[str] = None) -> PredictionFilters:
+    # The keyset cursor is the (fantasy_points, player_id) of the last row of the previous page
+    if (after_fantasy_points is None) != (after_player_id is None):
+        raise HTTPException(status_code=400,
+                            detail='after_fantasy_points and after_player_id must be given together')
+    return PredictionFilters(position, team, limit, after_fantasy_points, after_player_id)
+
+
+def apply_filters(stmt, filters: PredictionFilters, position_col, team_col, fantasy_points_col, player_id_col):
+    # stmt must already be ordered by (fantasy_points_col DESC, player_id_col DESC) for the cursor to hold
+    if filters is None:
+        return stmt
+    if filters.position is not None:
+        stmt = stmt.where(position_col == filters.position)
+    if filters.team is not None:
+        stmt = stmt.where(team_col == filters.team)
+    if filters.after_player_id is not None:
+        stmt = stmt.where(tuple_(fantasy_points_col, player_id_col) <
+                          tuple_(filters.after_fantasy_points, filters.after_player_id))
+    if filters.limit is not None:
+        stmt = stmt.limit(filters.limit)
+    return stmt
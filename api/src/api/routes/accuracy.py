@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
 
 import deps
+from api.pagination import PredictionFilters, get_prediction_filters
 from api.services.accuracy_service import AccuracyService
+from api.services.response_cache_service import ResponseCacheService
 
 router = APIRouter(tags=['schedule'], prefix='/api')
 
@@ -10,8 +14,13 @@ router = APIRouter(tags=['schedule'], prefix='/api')
 async def get_prediction_diffs(
         season: int,
         week: int,
-        actuals_service: AccuracyService = Depends(deps.get_actuals_service)):
-    return await actuals_service.get_prediction_diffs(season, week)
+        request: Request,
+        filters: PredictionFilters = Depends(get_prediction_filters),
+        actuals_service: AccuracyService = Depends(deps.get_actuals_service),
+        response_cache_service: ResponseCacheService = Depends(deps.get_response_cache_service)):
+    return await response_cache_service.get_or_compute(
+        request, ['prediction_diffs'], season, week,
+        lambda: actuals_service.get_prediction_diffs(season, week, filters))
 
 
 @router.get('/accuracy/metrics')
@@ -22,6 +31,21 @@ async def get_accuracy_metrics(
     return await actuals_service.get_accuracy_metrics(season, week)
 
 
+@router.get('/accuracy/trend')
+async def get_accuracy_trend(
+        start_season: int,
+        request: Request,
+        end_season: Optional[int] = None,
+        accuracy_service: AccuracyService = Depends(deps.get_actuals_service),
+        response_cache_service: ResponseCacheService = Depends(deps.get_response_cache_service)):
+    end_season = end_season if end_season is not None else start_season
+    if end_season < start_season:
+        raise HTTPException(status_code=400, detail='end_season must not be before start_season')
+    return await response_cache_service.get_or_compute_seasons(
+        request, ['prediction_diffs'], start_season, end_season,
+        lambda: accuracy_service.get_accuracy_trend(start_season, end_season))
+
+
 @router.get('/accuracy/completed-weeks')
 async def get_completed_weeks(
         accuracy_service: AccuracyService = Depends(deps.get_actuals_service)):
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from api.services.response_cache_service import get_response_cache_stats
+
+router = APIRouter(tags=['cache'], prefix='/api')
+
+
+@router.get('/cache-stats')
+async def get_cache_stats():
+    return get_response_cache_stats()
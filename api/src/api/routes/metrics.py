@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from api.metrics import metrics_response
+
+router = APIRouter(tags=['metrics'])
+
+
+@router.get('/metrics', include_in_schema=False)
+async def get_metrics():
+    return metrics_response()
@@ -1,29 +1,40 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
 
 import deps
-from api.services.predictions_service import PredictionsService
+from api.formats import ResponseFormat, serialize_columns
+from api.pagination import PredictionFilters, get_prediction_filters
+from api.schemas import ScoringConfig
+from api.services.predictions_service import PredictionsService, ScoringFormat
+from api.services.response_cache_service import ResponseCacheService
+from api.services.scoring_service import ScoringService
 router = APIRouter(tags=['predictions'], prefix='/api')
 
 
-@router.get('/predictions/half_ppr')
-async def get_half_ppr_predictions(
+@router.get('/predictions/{scoring_format}')
+async def get_predictions(
+        scoring_format: ScoringFormat,
         season: int,
         week: int,
-        predictions_service: PredictionsService = Depends(deps.get_predictions_service)):
-    return await predictions_service.get_half_ppr_predictions(season, week)
+        request: Request,
+        response_format: ResponseFormat = Query(ResponseFormat.json, alias='format'),
+        filters: PredictionFilters = Depends(get_prediction_filters),
+        predictions_service: PredictionsService = Depends(deps.get_predictions_service),
+        response_cache_service: ResponseCacheService = Depends(deps.get_response_cache_service)):
+    table_names = ['weekly_predictions_base', 'weekly_fantasy_points']
+    if response_format == ResponseFormat.json:
+        return await response_cache_service.get_or_compute(
+            request, table_names, season, week,
+            lambda: predictions_service.get_predictions(scoring_format, season, week, filters))
+    return await response_cache_service.get_or_compute(
+        request, table_names, season, week,
+        lambda: predictions_service.get_columnar_predictions(scoring_format, season, week, filters),
+        lambda columns: serialize_columns(columns, response_format))
 
 
-@router.get('/predictions/full_ppr')
-async def get_full_ppr_predictions(
+@router.post('/predictions/custom')
+async def get_custom_predictions(
         season: int,
         week: int,
-        predictions_service: PredictionsService = Depends(deps.get_predictions_service)):
-    return await predictions_service.get_full_ppr_predictions(season, week)
-
-
-@router.get('/predictions/dk_dfs')
-async def get_full_ppr_predictions(
-        season: int,
-        week: int,
-        predictions_service: PredictionsService = Depends(deps.get_predictions_service)):
-    return await predictions_service.get_dk_dfs_predictions(season, week)
+        scoring_config: ScoringConfig,
+        scoring_service: ScoringService = Depends(deps.get_scoring_service)):
+    return await scoring_service.get_custom_predictions(season, week, scoring_config)
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
 
 import deps
 from api.services.schedule_service import ScheduleService
@@ -8,5 +11,6 @@ router = APIRouter(tags=['schedule'], prefix='/api')
 
 @router.get('/current-season-week')
 async def get_current_season_week(
+        today: Optional[date] = Query(None, alias='date'),
         schedule_service: ScheduleService = Depends(deps.get_schedule_service)):
-    return await schedule_service.get_current_season_week()
+    return await schedule_service.get_current_season_week(today)
@@ -0,0 +1,27 @@
+import bisect
+from datetime import date, datetime
+from typing import Iterable, Optional, Tuple
+
+
+class ScheduleCalendar:
+    # Every game day in the schedule table held in memory, so resolving a date to its season / week is a binary
+    # search instead of a query
+    def __init__(self):
+        self._gamedays = []
+        self._season_weeks = []
+        self.version: Optional[datetime] = None
+        self.checked_at: Optional[float] = None
+
+    def load(self, games: Iterable[Tuple[date, int, int]], version: Optional[datetime] = None) -> None:
+        games = sorted(games)
+        self._gamedays = [gameday for gameday, _, _ in games]
+        self._season_weeks = [(season, week) for _, season, week in games]
+        self.version = version
+
+    def season_week_on(self, day: date) -> Optional[Tuple[int, int]]:
+        # Season / week of the first game on or after day, None once the last loaded season is over
+        i = bisect.bisect_left(self._gamedays, day)
+        return self._season_weeks[i] if i < len(self._gamedays) else None
+
+    def __len__(self) -> int:
+        return len(self._gamedays)
@@ -0,0 +1,25 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ScoringConfig(BaseModel):
+    # Mirrors jobs.shared.points_config.PointsConfig in the pipelines
+    pp_qb_yd: float
+    pp_qb_td: float
+    pp_rec: float
+    pp_rec_yd: float
+    pp_rec_td: float
+    pp_rush_yd: float
+    pp_rush_td: float
+    pp_fumble: float
+    pp_int: float
+    qb_yd_bonus_thresh: Optional[float] = None
+    pp_qb_yd_bonus: Optional[float] = None
+    rec_bonus_thresh: Optional[float] = None
+    pp_rec_bonus: Optional[float] = None
+    rush_bonus_thresh: Optional[float] = None
+    pp_rush_bonus: Optional[float] = None
+    pp_rushing_2pt_conversions: float
+    pp_receiving_2pt_conversions: float
+    pp_passing_2pt_conversions: float
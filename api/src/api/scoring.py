@@ -0,0 +1,44 @@
+import hashlib
+import json
+from typing import Dict
+
+import numpy as np
+
+from api.schemas import ScoringConfig
+
+# (stat column, per-unit points field on ScoringConfig)
+per_unit_points = [('passing_yards', 'pp_qb_yd'),
+                   ('passing_tds', 'pp_qb_td'),
+                   ('interceptions', 'pp_int'),
+                   ('receptions', 'pp_rec'),
+                   ('receiving_yards', 'pp_rec_yd'),
+                   ('receiving_tds', 'pp_rec_td'),
+                   ('rushing_yards', 'pp_rush_yd'),
+                   ('rushing_tds', 'pp_rush_td'),
+                   ('fumbles', 'pp_fumble'),
+                   ('rushing_2pt_conversions', 'pp_rushing_2pt_conversions'),
+                   ('receiving_2pt_conversions', 'pp_receiving_2pt_conversions'),
+                   ('passing_2pt_conversions', 'pp_passing_2pt_conversions')]
+
+# (stat column, threshold field, bonus points field on ScoringConfig)
+yardage_bonuses = [('passing_yards', 'qb_yd_bonus_thresh', 'pp_qb_yd_bonus'),
+                   ('receiving_yards', 'rec_bonus_thresh', 'pp_rec_bonus'),
+                   ('rushing_yards', 'rush_bonus_thresh', 'pp_rush_bonus')]
+
+
+def config_hash(config: ScoringConfig) -> str:
+    canonical = json.dumps(config.model_dump(), sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def calculate_fantasy_points(config: ScoringConfig, stats: Dict[str, np.ndarray]) -> np.ndarray:
+    n_rows = len(next(iter(stats.values()))) if stats else 0
+    points = np.zeros(n_rows, dtype=np.float64)
+    for col, field in per_unit_points:
+        points += np.nan_to_num(stats[col]) * getattr(config, field)
+    for col, thresh_field, bonus_field in yardage_bonuses:
+        thresh = getattr(config, thresh_field)
+        bonus = getattr(config, bonus_field)
+        if thresh is not None and bonus is not None:
+            points += np.where(np.nan_to_num(stats[col]) >= thresh, bonus, 0)
+    return points
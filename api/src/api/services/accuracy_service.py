@@ -1,26 +1,75 @@
-from sqlalchemy import select
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.models import PredictionDiff, AccuracyMetric
+from api.models import PredictionDiff, AccuracyMetric, CompletedWeek
+from api.pagination import PredictionFilters, apply_filters
 from api.services.predictions_service import PredictionsService
 
 
+# Every stat prediction_diffs has *_diff and *_actual columns for
+trend_stats = [col.name[:-len('_diff')] for col in PredictionDiff.__table__.columns if col.name.endswith('_diff')]
+# What the diffs response shows: the player, the predicted stats and how far off they were. The *_actual columns
+# are only read by the trend aggregates
+diff_columns = [col for col in PredictionDiff.__table__.columns if not col.name.endswith('_actual')]
+
+
+def trend_aggregates(stat: str) -> list:
+    diff = getattr(PredictionDiff, f'{stat}_diff')
+    actual = getattr(PredictionDiff, f'{stat}_actual')
+    return [
+        func.avg(func.abs(diff)).label(f'{stat}.MAE'),
+        func.sqrt(func.avg(diff * diff)).label(f'{stat}.RMSE'),
+        # 1 - SS_res / SS_tot, with SS_tot = n * population variance of the actuals
+        (1 - func.sum(diff * diff) / func.nullif(func.var_pop(actual) * func.count(actual), 0))
+        .label(f'{stat}.R_squared'),
+    ]
+
+
 class AccuracyService:
     def __init__(self, db: AsyncSession, predictions_service: PredictionsService):
         self.db = db
         self.predictions_service = predictions_service
 
-    async def get_prediction_diffs(self, season: int, week: int):
+    async def get_prediction_diffs(self, season: int, week: int, filters: PredictionFilters = None):
         stmt = (
-            select(PredictionDiff)
+            select(*diff_columns)
             .where(PredictionDiff.season == season, PredictionDiff.week == week)
-            .order_by(PredictionDiff.fantasy_points.desc())
+            .order_by(PredictionDiff.fantasy_points.desc(), PredictionDiff.player_id.desc())
         )
-        preds = (await self.db.execute(stmt)).scalars().all()
-        return preds
+        stmt = apply_filters(stmt, filters, PredictionDiff.position, PredictionDiff.team,
+                             PredictionDiff.fantasy_points, PredictionDiff.player_id)
+        return (await self.db.execute(stmt)).mappings().all()
 
 
+    async def get_accuracy_trend(self, start_season: int, end_season: int):
+        # One grouped pass over prediction_diffs, GROUPING SETS gives the overall and per position rows of each week
+        # together
+        by_week = tuple_(PredictionDiff.season, PredictionDiff.week)
+        by_position = tuple_(PredictionDiff.season, PredictionDiff.week, PredictionDiff.position)
+        stmt = (
+            select(PredictionDiff.season, PredictionDiff.week, PredictionDiff.position,
+                   func.grouping(PredictionDiff.position).label('all_positions'),
+                   func.count().label('player_count'),
+                   *[agg for stat in trend_stats for agg in trend_aggregates(stat)])
+            .where(PredictionDiff.season.between(start_season, end_season))
+            .group_by(func.grouping_sets(by_week, by_position))
+            .order_by(PredictionDiff.season, PredictionDiff.week)
+        )
+        result = await self.db.execute(stmt)
+
+        weeks = {}
+        for row in result.mappings():
+            week = weeks.setdefault((row['season'], row['week']),
+                                    {'season': row['season'], 'week': row['week'], 'overall': None, 'positions': {}})
+            metrics = {'player_count': row['player_count'],
+                       'stats': {stat: {metric: row[f'{stat}.{metric}'] for metric in ('MAE', 'RMSE', 'R_squared')}
+                                 for stat in trend_stats}}
+            if row['all_positions']:
+                week['overall'] = metrics
+            else:
+                week['positions'][row['position']] = metrics
+        return list(weeks.values())
+
     async def get_accuracy_metrics(self, season: int, week: int):
         stmt = (
             select(AccuracyMetric)
@@ -31,13 +80,9 @@ class AccuracyService:
 
 
     async def get_completed_season_weeks(self):
+        # Served from the summary weekly_accuracy maintains, one primary key ordered scan of a row per week
         stmt = (
-            select(PredictionDiff.season, PredictionDiff.week).distinct()
+            select(CompletedWeek)
+            .order_by(CompletedWeek.season, CompletedWeek.week)
         )
-        results = await self.db.execute(stmt)
-
-        unpacked_results = [
-            {"season": row.season, "week": row.week}
-            for row in results
-        ]
-        return unpacked_results
+        return (await self.db.execute(stmt)).scalars().all()
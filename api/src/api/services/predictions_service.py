@@ -1,8 +1,18 @@
+from enum import Enum
+from typing import Dict
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from api.models import WeeklyPredictionBase, WeeklyPredictionStdHalfPPR, WeeklyPredictionStdFullPPR, \
-    WeeklyPredictionDKDFS
+from api.formats import rows_to_columns
+from api.pagination import PredictionFilters, apply_filters
+from api.models import WeeklyPredictionBase, WeeklyFantasyPoints
+
+
+class ScoringFormat(str, Enum):
+    half_ppr = 'half_ppr'
+    full_ppr = 'full_ppr'
+    dk_dfs = 'dk_dfs'
 
 
 class PredictionsService:
@@ -10,50 +20,38 @@ class PredictionsService:
         self.db = db
 
     @staticmethod
-    def get_base_predictions_query(season: int, week: int, league_config_predictions):
+    def get_base_predictions_query(season: int, week: int, scoring_format: ScoringFormat,
+                                   filters: PredictionFilters = None):
         stmt = (
-            select(WeeklyPredictionBase, league_config_predictions.fantasy_points)
-            .join(league_config_predictions, (WeeklyPredictionBase.player_id == league_config_predictions.player_id) &
-                  (WeeklyPredictionBase.season == league_config_predictions.season) &
-                  (WeeklyPredictionBase.week == league_config_predictions.week))
+            select(WeeklyPredictionBase, WeeklyFantasyPoints.fantasy_points)
+            .join(WeeklyFantasyPoints, (WeeklyPredictionBase.player_id == WeeklyFantasyPoints.player_id) &
+                  (WeeklyPredictionBase.season == WeeklyFantasyPoints.season) &
+                  (WeeklyPredictionBase.week == WeeklyFantasyPoints.week))
             .where(
-                WeeklyPredictionBase.season == season,
-                WeeklyPredictionBase.week == week
+                WeeklyFantasyPoints.season == season,
+                WeeklyFantasyPoints.week == week,
+                WeeklyFantasyPoints.scoring_format == scoring_format.value
             )
-            .order_by(league_config_predictions.fantasy_points.desc())
+            .order_by(WeeklyFantasyPoints.fantasy_points.desc(), WeeklyFantasyPoints.player_id.desc())
         )
-        return stmt
-
-    async def get_half_ppr_predictions(self, season: int, week: int):
-        stmt = self.get_base_predictions_query(season, week, WeeklyPredictionStdHalfPPR)
-        result = await self.db.execute(stmt)
-        predictions = result.fetchall()  # This returns a list of tuples (WeeklyPredictionBase, WeeklyPredictionStdHalfPPR)
-        # Unpack tuples into a list of dicts or any other structure you need
-        unpacked_predictions = [
-            {"base": base, "fantasy_points": std_half_ppr}
-            for base, std_half_ppr in predictions
-        ]
-        return unpacked_predictions
+        return apply_filters(stmt, filters, WeeklyPredictionBase.position, WeeklyPredictionBase.team,
+                             WeeklyFantasyPoints.fantasy_points, WeeklyFantasyPoints.player_id)
 
-    async def get_full_ppr_predictions(self, season: int, week: int):
-        stmt = self.get_base_predictions_query(season, week, WeeklyPredictionStdFullPPR)
+    async def get_predictions(self, scoring_format: ScoringFormat, season: int, week: int,
+                              filters: PredictionFilters = None):
+        stmt = self.get_base_predictions_query(season, week, scoring_format, filters)
         result = await self.db.execute(stmt)
-        predictions = result.fetchall()  # This returns a list of tuples (WeeklyPredictionBase, WeeklyPredictionStdHalfPPR)
-        # Unpack tuples into a list of dicts or any other structure you need
+        predictions = result.fetchall()  # This returns a list of tuples (WeeklyPredictionBase, fantasy_points)
         unpacked_predictions = [
-            {"base": base, "fantasy_points": std_full_ppr}
-            for base, std_full_ppr in predictions
+            {"base": base, "fantasy_points": fantasy_points}
+            for base, fantasy_points in predictions
         ]
         return unpacked_predictions
 
-
-    async def get_dk_dfs_predictions(self, season: int, week: int):
-        stmt = self.get_base_predictions_query(season, week, WeeklyPredictionDKDFS)
+    async def get_columnar_predictions(self, scoring_format: ScoringFormat, season: int, week: int,
+                                       filters: PredictionFilters = None) -> Dict[str, list]:
+        # Same join as get_base_predictions_query but selecting plain columns, so no ORM objects get built
+        stmt = self.get_base_predictions_query(season, week, scoring_format, filters) \
+                   .with_only_columns(*WeeklyPredictionBase.__table__.columns, WeeklyFantasyPoints.fantasy_points)
         result = await self.db.execute(stmt)
-        predictions = result.fetchall()  # This returns a list of tuples (WeeklyPredictionBase, WeeklyPredictionStdHalfPPR)
-        # Unpack tuples into a list of dicts or any other structure you need
-        unpacked_predictions = [
-            {"base": base, "fantasy_points": fantasy_points}
-            for base, fantasy_points in predictions
-        ]
-        return unpacked_predictions
\ No newline at end of file
+        return rows_to_columns(result.fetchall(), list(result.keys()))
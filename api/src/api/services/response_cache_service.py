@@ -0,0 +1,99 @@
+import hashlib
+import json
+import time
+from typing import Awaitable, Callable, List, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.cache import LRUCache
+from api.metrics import serialization_seconds
+from api.models import DataVersion
+from api.settings import settings
+
+# Serialized responses shared across requests, keyed by ETag
+response_cache = LRUCache(settings.RESPONSE_CACHE_SIZE)
+response_cache_stats = {'not_modified': 0}
+
+
+async def get_data_versions(db: AsyncSession, table_names: List[str], season: int, week: int) -> dict:
+    # Bumped by the pipelines every time they write a season / week of a table
+    stmt = (
+        select(DataVersion.table_name, DataVersion.version)
+        .where(DataVersion.table_name.in_(table_names),
+               DataVersion.season == season,
+               DataVersion.week == week)
+    )
+    versions = {row.table_name: row.version for row in await db.execute(stmt)}
+    return {table_name: versions.get(table_name, 0) for table_name in sorted(table_names)}
+
+
+async def get_season_range_versions(db: AsyncSession, table_names: List[str], start_season: int,
+                                    end_season: int) -> dict:
+    # Summed over every week in the range, grows whenever any of those weeks is rewritten or a new one lands
+    stmt = (
+        select(DataVersion.table_name, func.sum(DataVersion.version).label('version'))
+        .where(DataVersion.table_name.in_(table_names),
+               DataVersion.season.between(start_season, end_season))
+        .group_by(DataVersion.table_name)
+    )
+    versions = {row.table_name: int(row.version) for row in await db.execute(stmt)}
+    return {table_name: versions.get(table_name, 0) for table_name in sorted(table_names)}
+
+
+class ResponseCacheService:
+    def __init__(self, db: AsyncSession, cache: LRUCache = response_cache):
+        self.db = db
+        self.cache = cache
+
+    async def get_or_compute(self, request: Request, table_names: List[str], season: int, week: int,
+                             compute: Callable[[], Awaitable],
+                             serialize: Callable[[object], Tuple[bytes, str]] = None) -> Response:
+        # serialize turns compute()'s result into (body, media type), defaults to the usual JSON encoding
+        versions = await get_data_versions(self.db, table_names, season, week)
+        return await self.respond(request, versions, compute, serialize)
+
+    async def get_or_compute_seasons(self, request: Request, table_names: List[str], start_season: int,
+                                     end_season: int, compute: Callable[[], Awaitable],
+                                     serialize: Callable[[object], Tuple[bytes, str]] = None) -> Response:
+        versions = await get_season_range_versions(self.db, table_names, start_season, end_season)
+        return await self.respond(request, versions, compute, serialize)
+
+    async def respond(self, request: Request, versions: dict, compute: Callable[[], Awaitable],
+                      serialize: Callable[[object], Tuple[bytes, str]] = None) -> Response:
+        key = json.dumps({'path': request.url.path, 'query': sorted(request.query_params.multi_items()),
+                          'versions': versions})
+        etag = f'"{hashlib.sha256(key.encode("utf-8")).hexdigest()}"'
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+
+        if request.headers.get('if-none-match') == etag:
+            response_cache_stats['not_modified'] += 1
+            return Response(status_code=304, headers=headers)
+
+        cached = self.cache.get(etag)
+        if cached is None:
+            serialize = serialize if serialize is not None else serialize_json
+            result = await compute()
+            start = time.perf_counter()
+            cached = serialize(result)
+            serialization_seconds.labels(cached[1]).observe(time.perf_counter() - start)
+            self.cache.set(etag, cached)
+        body, media_type = cached
+        return Response(content=body, media_type=media_type, headers=headers)
+
+
+def serialize_json(result) -> Tuple[bytes, str]:
+    return json.dumps(jsonable_encoder(result)).encode('utf-8'), 'application/json'
+
+
+def get_response_cache_stats() -> dict:
+    lookups = response_cache.hits + response_cache.misses
+    return {
+        'hits': response_cache.hits,
+        'misses': response_cache.misses,
+        'not_modified': response_cache_stats['not_modified'],
+        'hit_rate': response_cache.hits / lookups if lookups else 0.0,
+        'size': len(response_cache),
+    }
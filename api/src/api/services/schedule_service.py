@@ -1,27 +1,42 @@
-from sqlalchemy import select
+import time
+from datetime import date
+
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql.functions import current_date
 
-from api.models import Schedule
+from api.models import DataVersion, Schedule
+from api.schedule_calendar import ScheduleCalendar
+from api.settings import settings
+
+# Loaded at startup and shared across requests, reloaded when populate_schedule bumps the schedule's data version
+schedule_calendar = ScheduleCalendar()
 
 
 class ScheduleService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, calendar: ScheduleCalendar = schedule_calendar):
         self.db = db
+        self.calendar = calendar
 
-    async def get_current_season_week(self):
-        # TODO: can make this testable by passing in current_date instead of pulling it here
-        stmt = (
-            select(Schedule.season, Schedule.week)
-            .where(current_date() <= Schedule.gameday)
-            .order_by(Schedule.gameday)
-            .limit(1)
-        )
+    async def refresh_calendar(self, force: bool = False) -> None:
+        # At most one cheap version lookup per SCHEDULE_REFRESH_SECS, the schedule itself is only re-read on change
+        now = time.monotonic()
+        if not force and self.calendar.checked_at is not None and \
+                now - self.calendar.checked_at < settings.SCHEDULE_REFRESH_SECS:
+            return
+        version = (await self.db.execute(
+            select(func.max(DataVersion.updated_at)).where(DataVersion.table_name == 'schedule')
+        )).scalar()
+        if force or self.calendar.checked_at is None or version != self.calendar.version:
+            games = await self.db.execute(select(Schedule.gameday, Schedule.season, Schedule.week))
+            self.calendar.load(games.all(), version)
+        self.calendar.checked_at = now
 
-        result = await self.db.execute(stmt)
-        row = result.fetchone()
+    async def get_current_season_week(self, today: date = None):
+        await self.refresh_calendar()
+        season_week = self.calendar.season_week_on(today if today is not None else date.today())
 
-        if row:
-            return {"season": row.season, "week": row.week}
+        if season_week:
+            season, week = season_week
+            return {"season": season, "week": week}
         else:
             return None
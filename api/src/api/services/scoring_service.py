@@ -0,0 +1,44 @@
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.cache import LRUCache
+from api.models import WeeklyPredictionBase
+from api.schemas import ScoringConfig
+from api.scoring import calculate_fantasy_points, config_hash, per_unit_points
+from api.services.response_cache_service import get_data_versions
+from api.settings import settings
+
+# Shared across requests so users with the same league settings reuse each other's results
+custom_scoring_cache = LRUCache(settings.CUSTOM_SCORING_CACHE_SIZE)
+
+
+class ScoringService:
+    def __init__(self, db: AsyncSession, cache: LRUCache = custom_scoring_cache):
+        self.db = db
+        self.cache = cache
+
+    async def get_custom_predictions(self, season: int, week: int, config: ScoringConfig):
+        data_version = (await get_data_versions(self.db, ['weekly_predictions_base'], season, week))[
+            'weekly_predictions_base']
+        cache_key = (config_hash(config), season, week, data_version)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        stmt = (
+            select(*WeeklyPredictionBase.__table__.columns)
+            .where(WeeklyPredictionBase.season == season, WeeklyPredictionBase.week == week)
+        )
+        rows = (await self.db.execute(stmt)).mappings().all()
+
+        stats = {col: np.array([row[col] for row in rows], dtype=np.float64) for col, _ in per_unit_points}
+        fantasy_points = calculate_fantasy_points(config, stats)
+        ranking = np.argsort(-fantasy_points, kind='stable')
+
+        predictions = [
+            {"base": dict(rows[i]), "fantasy_points": float(fantasy_points[i])}
+            for i in ranking
+        ]
+        self.cache.set(cache_key, predictions)
+        return predictions
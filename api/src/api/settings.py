@@ -13,6 +13,11 @@ else:
 class Settings(BaseSettings):
     POSTGRES_CONN_STRING: str
     UI_URL: str
+    CUSTOM_SCORING_CACHE_SIZE: int = 1024
+    RESPONSE_CACHE_SIZE: int = 256
+    MAX_PAGE_SIZE: int = 1000
+    SCHEDULE_REFRESH_SECS: int = 300
+    SQL_ECHO_SAMPLE_RATE: float = 0.0
 
     class Config:
         env_file = ".env.local" if os.path.exists(".env.local") else ".env"
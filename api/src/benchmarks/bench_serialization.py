@@ -0,0 +1,61 @@
+import argparse
+import json
+import random
+import time
+
+from fastapi.encoders import jsonable_encoder
+
+from api.formats import ResponseFormat, rows_to_columns, serialize_columns
+from api.models import WeeklyPredictionBase
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=600)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def make_rows(n_rows: int, seed: int):
+    rng = random.Random(seed)
+    column_names = [col.name for col in WeeklyPredictionBase.__table__.columns] + ['fantasy_points']
+    rows = []
+    for i in range(n_rows):
+        row = {}
+        for col in WeeklyPredictionBase.__table__.columns:
+            if col.name in ('season', 'week'):
+                row[col.name] = 2024 if col.name == 'season' else 1
+            elif col.type.python_type is str:
+                row[col.name] = f'{col.name}_{i}'[:12]
+            else:
+                row[col.name] = rng.random() * 100
+        row['fantasy_points'] = rng.random() * 30
+        rows.append(tuple(row[name] for name in column_names))
+    return column_names, rows
+
+
+def orm_json(column_names, rows):
+    # Current default: ORM objects wrapped in dicts and walked by jsonable_encoder
+    predictions = [{'base': WeeklyPredictionBase(**dict(zip(column_names[:-1], row[:-1]))),
+                    'fantasy_points': row[-1]} for row in rows]
+    return json.dumps(jsonable_encoder(predictions)).encode('utf-8')
+
+
+def timed(fn, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = fn()
+    return body, (time.perf_counter() - start) / repeat
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    column_names, rows = make_rows(args.rows, args.seed)
+
+    body, secs = timed(lambda: orm_json(column_names, rows), args.repeat)
+    print(f'{"orm json":<10} {secs * 1000:8.2f}ms {len(body) / 1024:8.1f}KB')
+    for response_format in [ResponseFormat.columnar, ResponseFormat.arrow, ResponseFormat.parquet]:
+        (body, _), secs = timed(lambda: serialize_columns(rows_to_columns(rows, column_names), response_format),
+                                args.repeat)
+        print(f'{response_format.value:<10} {secs * 1000:8.2f}ms {len(body) / 1024:8.1f}KB')
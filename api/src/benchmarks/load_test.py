@@ -0,0 +1,211 @@
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple, Optional
+
+import httpx
+import numpy as np
+from prometheus_client.parser import text_string_to_metric_families
+
+from api.services.predictions_service import ScoringFormat
+
+# Drives every API route against a database seeded by seed_load_test_db.py and records latency, throughput and DB
+# queries per request, either in process through the ASGI app or against a running server with --base_url
+# Needs httpx, which is in requirements.txt for this harness only, the API itself doesn't use it
+
+
+class Scenario(NamedTuple):
+    name: str
+    method: str
+    # Builds (url, json body) for one request
+    make_request: Callable[[random.Random], tuple]
+
+
+custom_scoring = {'pp_qb_yd': 0.04, 'pp_qb_td': 4, 'pp_rec': 0.5, 'pp_rec_yd': 0.1, 'pp_rec_td': 6,
+                  'pp_rush_yd': 0.1, 'pp_rush_td': 6, 'pp_fumble': -2, 'pp_int': -1,
+                  'pp_rushing_2pt_conversions': 2, 'pp_receiving_2pt_conversions': 2,
+                  'pp_passing_2pt_conversions': 2}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--start_season', type=int, default=2022)
+    parser.add_argument('--seasons', type=int, default=3)
+    parser.add_argument('--completed_weeks', type=int, default=12, help='Weeks of the last season with diffs')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per scenario')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--scenarios', nargs='*', default=None, help='Only run these scenarios')
+    parser.add_argument('--base_url', default=None, help='Hit a running server instead of the app in process')
+    parser.add_argument('--output', default=None, help='Defaults to load_test_<commit>.json')
+    parser.add_argument('--compare', default=None, help='Earlier results file to print deltas against')
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def build_scenarios(args) -> List[Scenario]:
+    seasons = list(range(args.start_season, args.start_season + args.seasons))
+
+    def any_week(rng):
+        return rng.choice(seasons), rng.randint(1, 18)
+
+    def completed_week(rng):
+        season = rng.choice(seasons)
+        return season, rng.randint(1, args.completed_weeks if season == seasons[-1] else 18)
+
+    def predictions(response_format: str = 'json', extra: str = ''):
+        def make_request(rng):
+            season, week = any_week(rng)
+            scoring_format = rng.choice(list(ScoringFormat)).value
+            return f'/api/predictions/{scoring_format}?season={season}&week={week}&format={response_format}{extra}', None
+        return make_request
+
+    def custom(rng):
+        season, week = any_week(rng)
+        return f'/api/predictions/custom?season={season}&week={week}', custom_scoring
+
+    def diffs(rng):
+        season, week = completed_week(rng)
+        return f'/api/accuracy/diffs?season={season}&week={week}', None
+
+    def metrics(rng):
+        season, week = completed_week(rng)
+        return f'/api/accuracy/metrics?season={season}&week={week}', None
+
+    def trend(rng):
+        start = rng.choice(seasons)
+        return f'/api/accuracy/trend?start_season={start}&end_season={seasons[-1]}', None
+
+    return [
+        Scenario('predictions_json', 'GET', predictions()),
+        Scenario('predictions_columnar', 'GET', predictions('columnar')),
+        Scenario('predictions_arrow', 'GET', predictions('arrow')),
+        Scenario('predictions_parquet', 'GET', predictions('parquet')),
+        Scenario('predictions_wr_page', 'GET', predictions(extra='&position=WR&limit=50')),
+        Scenario('predictions_custom', 'POST', custom),
+        Scenario('current_season_week', 'GET', lambda rng: ('/api/current-season-week', None)),
+        Scenario('accuracy_diffs', 'GET', diffs),
+        Scenario('accuracy_diffs_qb_page', 'GET',
+                 lambda rng: (diffs(rng)[0] + '&position=QB&limit=25', None)),
+        Scenario('accuracy_metrics', 'GET', metrics),
+        Scenario('accuracy_completed_weeks', 'GET', lambda rng: ('/api/accuracy/completed-weeks', None)),
+        Scenario('accuracy_trend', 'GET', trend),
+        Scenario('cache_stats', 'GET', lambda rng: ('/api/cache-stats', None)),
+    ]
+
+
+@asynccontextmanager
+async def make_client(base_url: Optional[str]):
+    if base_url is not None:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            yield client
+        return
+
+    from main import app
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://load-test', timeout=60) as client:
+            yield client
+
+
+async def db_query_totals(client: httpx.AsyncClient) -> tuple:
+    # (queries, requests) summed over every route from the API's own /metrics
+    queries, requests = 0.0, 0.0
+    for family in text_string_to_metric_families((await client.get('/metrics')).text):
+        if family.name == 'api_request_db_queries':
+            for sample in family.samples:
+                if sample.labels.get('route') == '/metrics':
+                    continue
+                if sample.name.endswith('_sum'):
+                    queries += sample.value
+                elif sample.name.endswith('_count'):
+                    requests += sample.value
+    return queries, requests
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, n_requests: int, concurrency: int,
+                       rng: random.Random) -> dict:
+    requests = [scenario.make_request(rng) for _ in range(n_requests)]
+    latencies, errors = [], 0
+    queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            url, body = queue.get_nowait()
+            start = time.perf_counter()
+            response = await client.request(scenario.method, url, json=body)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+
+    queries_before, requests_before = await db_query_totals(client)
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - start
+    queries_after, requests_after = await db_query_totals(client)
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        'requests': n_requests,
+        'errors': errors,
+        'p50_ms': float(np.percentile(latencies_ms, 50)),
+        'p95_ms': float(np.percentile(latencies_ms, 95)),
+        'p99_ms': float(np.percentile(latencies_ms, 99)),
+        'mean_ms': float(latencies_ms.mean()),
+        'throughput_rps': n_requests / elapsed,
+        'db_queries_per_request': (queries_after - queries_before) / max(requests_after - requests_before, 1),
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def print_results(results: dict, baseline: Optional[dict]) -> None:
+    print(f'{"scenario":<26} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"req/s":>8} {"queries":>8} {"errors":>7}')
+    for name, r in results.items():
+        line = (f'{name:<26} {r["p50_ms"]:8.2f} {r["p95_ms"]:8.2f} {r["p99_ms"]:8.2f} {r["throughput_rps"]:8.1f} '
+                f'{r["db_queries_per_request"]:8.2f} {r["errors"]:7d}')
+        if baseline is not None and name in baseline:
+            before = baseline[name]
+            line += (f'   p95 {(r["p95_ms"] / before["p95_ms"] - 1) * 100:+6.1f}%'
+                     f'   req/s {(r["throughput_rps"] / before["throughput_rps"] - 1) * 100:+6.1f}%')
+        print(line)
+
+
+async def main(args) -> None:
+    rng = random.Random(args.seed)
+    scenarios = [scenario for scenario in build_scenarios(args)
+                 if args.scenarios is None or scenario.name in args.scenarios]
+
+    results = {}
+    async with make_client(args.base_url) as client:
+        for scenario in scenarios:
+            results[scenario.name] = await run_scenario(client, scenario, args.requests, args.concurrency, rng)
+
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+    print_results(results, baseline)
+
+    commit = git_commit()
+    output = args.output if args.output is not None else f'load_test_{commit}.json'
+    with open(output, 'w') as f:
+        json.dump({'commit': commit, 'run_at': datetime.now(timezone.utc).isoformat(),
+                   'config': vars(args), 'results': results}, f, indent=2)
+    print(f'Saved results to {output}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,142 @@
+import argparse
+import asyncio
+import random
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from api.models import Base, WeeklyPredictionBase, WeeklyFantasyPoints, PredictionDiff, AccuracyMetric, \
+    CompletedWeek, Schedule, DataVersion
+from api.services.accuracy_service import trend_stats
+from api.services.predictions_service import ScoringFormat
+from api.settings import settings
+
+# Synthetic data shaped like production: ~600 rostered players a week, 18 weeks a season, 16 games a week
+
+teams = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
+         'LA', 'LAC', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS']
+position_weights = {'QB': 0.12, 'RB': 0.28, 'WR': 0.4, 'TE': 0.2}
+weeks_per_season = 18
+seeded_tables = [WeeklyPredictionBase, WeeklyFantasyPoints, PredictionDiff, AccuracyMetric, CompletedWeek, Schedule,
+                 DataVersion]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--start_season', type=int, default=2022)
+    parser.add_argument('--seasons', type=int, default=3)
+    parser.add_argument('--players', type=int, default=600)
+    parser.add_argument('--completed_weeks', type=int, default=None,
+                        help='Weeks of the last season with diffs, defaults to all but the last 6')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--yes', action='store_true', help='Confirm the seeded tables may be truncated')
+    return parser.parse_args()
+
+
+def make_players(n_players: int, rng: random.Random):
+    positions = rng.choices(list(position_weights), weights=list(position_weights.values()), k=n_players)
+    return [(f'00-{i:07d}', f'Player {i}', positions[i], teams[i % len(teams)]) for i in range(n_players)]
+
+
+def stat_value(stat: str, rng: random.Random) -> float:
+    return rng.gammavariate(1.5, 20.0 if 'yards' in stat else 0.5)
+
+
+def make_week(season: int, week: int, players, completed: bool, rng: random.Random):
+    base_cols = [col.name for col in WeeklyPredictionBase.__table__.columns]
+    base, fantasy_points, diffs = [], [], []
+    for player_id, player_name, position, team in players:
+        stats = {stat: stat_value(stat, rng) for stat in trend_stats if stat != 'fantasy_points'}
+        row = dict(stats, player_id=player_id, player_name=player_name, position=position, team=team,
+                   opponent=teams[(teams.index(team) + week) % len(teams)], season=season, week=week)
+        base.append(tuple(row[col] for col in base_cols))
+        points = {scoring_format.value: rng.gammavariate(2.0, 5.0) for scoring_format in ScoringFormat}
+        fantasy_points.extend((season, week, scoring_format, player_id, value)
+                              for scoring_format, value in points.items())
+        if completed:
+            diff = dict(row, fantasy_points=points['half_ppr'])
+            for stat in trend_stats:
+                actual = max(diff[stat] + rng.gauss(0, diff[stat] * 0.6 + 0.5), 0.0)
+                diff[f'{stat}_actual'] = actual
+                diff[f'{stat}_diff'] = actual - diff[stat]
+            diffs.append(diff)
+    return base, fantasy_points, diffs
+
+
+def make_schedule(season: int, week: int):
+    first_sunday = date(season, 9, 7) + timedelta(days=(6 - date(season, 9, 7).weekday()) % 7)
+    sunday = first_sunday + timedelta(weeks=week - 1)
+    games = []
+    for game in range(len(teams) // 2):
+        gameday = sunday - timedelta(days=3) if game == 0 else sunday + timedelta(days=1) if game == 15 else sunday
+        games.append((f'{season}_{week:02d}_{teams[game]}_{teams[-game - 1]}', season, week, gameday,
+                      time(13, 0), gameday.strftime('%A'), teams[game], teams[-game - 1]))
+    return games
+
+
+def accuracy_row(season: int, week: int, diffs):
+    diff = [row['fantasy_points_diff'] for row in diffs]
+    actual = [row['fantasy_points_actual'] for row in diffs]
+    mse = sum(d * d for d in diff) / len(diff)
+    mean = sum(actual) / len(actual)
+    r_squared = 1 - sum(d * d for d in diff) / sum((a - mean) ** 2 for a in actual)
+    return season, week, sum(abs(d) for d in diff) / len(diff), mse, mse ** 0.5, r_squared
+
+
+async def copy_rows(conn, model, columns, rows) -> None:
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(model.__tablename__, records=rows, columns=columns)
+
+
+async def seed(args) -> None:
+    rng = random.Random(args.seed)
+    players = make_players(args.players, rng)
+    seasons = list(range(args.start_season, args.start_season + args.seasons))
+    completed_weeks = args.completed_weeks if args.completed_weeks is not None else weeks_per_season - 6
+    now = datetime.now(timezone.utc)
+
+    engine = create_async_engine(settings.POSTGRES_CONN_STRING)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text('truncate ' + ', '.join(model.__tablename__ for model in seeded_tables)))
+
+        base_cols = [col.name for col in WeeklyPredictionBase.__table__.columns]
+        diff_cols = [col.name for col in PredictionDiff.__table__.columns]
+        # Some *_actual counts are INTEGER columns
+        int_cols = {col.name for col in PredictionDiff.__table__.columns if col.type.python_type is int}
+        versions = []
+        for season in seasons:
+            for week in range(1, weeks_per_season + 1):
+                completed = season != seasons[-1] or week <= completed_weeks
+                base, fantasy_points, diffs = make_week(season, week, players, completed, rng)
+                await copy_rows(conn, WeeklyPredictionBase, base_cols, base)
+                await copy_rows(conn, WeeklyFantasyPoints,
+                                ['season', 'week', 'scoring_format', 'player_id', 'fantasy_points'], fantasy_points)
+                await copy_rows(conn, Schedule, ['game_id', 'season', 'week', 'gameday', 'gametime', 'weekday',
+                                                 'home_team', 'away_team'], make_schedule(season, week))
+                tables = ['weekly_predictions_base', 'weekly_fantasy_points', 'schedule']
+                if completed:
+                    await copy_rows(conn, PredictionDiff, diff_cols,
+                                    [tuple(round(row[col]) if col in int_cols else row[col] for col in diff_cols)
+                                     for row in diffs])
+                    metrics = accuracy_row(season, week, diffs)
+                    await copy_rows(conn, AccuracyMetric, ['season', 'week', 'MAE', 'MSE', 'RMSE', 'R_squared'],
+                                    [metrics])
+                    await copy_rows(conn, CompletedWeek, ['season', 'week', 'player_count', 'computed_at', 'MAE',
+                                                          'MSE', 'RMSE', 'R_squared'],
+                                    [(season, week, len(diffs), now, *metrics[2:])])
+                    tables += ['prediction_diffs', 'accuracy_metrics', 'completed_weeks']
+                versions.extend((table_name, season, week, 1, now) for table_name in tables)
+            print(f'Seeded season {season}')
+        await copy_rows(conn, DataVersion, ['table_name', 'season', 'week', 'version', 'updated_at'], versions)
+        await conn.execute(text('analyze'))
+    await engine.dispose()
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if not args.yes:
+        raise SystemExit(f'This truncates {", ".join(model.__tablename__ for model in seeded_tables)} in '
+                         f'POSTGRES_CONN_STRING, point it at a scratch database and pass --yes')
+    asyncio.run(seed(args))
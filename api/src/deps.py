@@ -4,7 +4,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from api.database import get_db_session
 from api.services.accuracy_service import AccuracyService
 from api.services.predictions_service import PredictionsService
+from api.services.response_cache_service import ResponseCacheService
 from api.services.schedule_service import ScheduleService
+from api.services.scoring_service import ScoringService
 from api.settings import Settings
 
 
@@ -16,6 +18,14 @@ def get_predictions_service(db: AsyncSession = Depends(get_db_session)) -> Predi
     return PredictionsService(db)
 
 
+def get_scoring_service(db: AsyncSession = Depends(get_db_session)) -> ScoringService:
+    return ScoringService(db)
+
+
+def get_response_cache_service(db: AsyncSession = Depends(get_db_session)) -> ResponseCacheService:
+    return ResponseCacheService(db)
+
+
 def get_schedule_service(db: AsyncSession = Depends(get_db_session)) -> ScheduleService:
     return ScheduleService(db)
 
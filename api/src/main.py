@@ -1,11 +1,32 @@
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
-from api.routes import predictions, schedule, accuracy
+from api.database import async_session
+from api.metrics import metrics_middleware
+from api.routes import predictions, schedule, accuracy, cache, metrics
+from api.services.schedule_service import ScheduleService
 from api.settings import settings
 
+logger = logging.getLogger('api')
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the schedule calendar up front so the first current-season-week request doesn't pay for it. The tables
+    # come from the pipelines' migrations, so on a fresh database (or a blip) boot anyway and let the first request
+    # load it
+    try:
+        async with async_session() as db:
+            await ScheduleService(db).refresh_calendar(force=True)
+    except Exception as e:
+        logger.warning(f'Could not load the schedule calendar at startup, will load it on first use: {e}')
+    yield
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,8 +35,11 @@ app.add_middleware(
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
 )
+app.middleware('http')(metrics_middleware)
 
 
 app.include_router(predictions.router)
 app.include_router(schedule.router)
 app.include_router(accuracy.router)
+app.include_router(cache.router)
+app.include_router(metrics.router)
@@ -0,0 +1,58 @@
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+from jobs.ml.train_prediction_model import EnsembleModel, model_params
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--train-rows', type=int, default=5_000)
+    parser.add_argument('--predict-rows', type=int, default=2_000)
+    parser.add_argument('--features', type=int, default=50)
+    parser.add_argument('--outputs', type=int, default=12)
+    parser.add_argument('--weeks', type=int, nargs='+', default=[1, 17])
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def per_model_predict(models, X):
+    # Previous EnsembleModel.predict: stack every forest's output then average
+    predictions = np.array([model.predict(X) for model in models])
+    weights = np.linspace(0.5, 1, len(models))
+    weights = weights / np.sum(weights)
+    return np.average(predictions, axis=0, weights=weights)
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn(*args)
+    secs = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, secs, peak / 1024 ** 2
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    rng = np.random.default_rng(args.seed)
+    X_train = rng.normal(size=(args.train_rows, args.features)).astype(np.float32)
+    y_train = rng.gamma(1.5, 10, size=(args.train_rows, args.outputs))
+    X = rng.normal(size=(args.predict_rows, args.features)).astype(np.float32)
+
+    models = []
+    for week in range(1, max(args.weeks) + 1):
+        rows = int(args.train_rows * (0.8 + 0.2 * week / max(args.weeks)))
+        models.append(RandomForestRegressor(**model_params).fit(X_train[:rows], y_train[:rows]))
+
+    for week in args.weeks:
+        ensemble = EnsembleModel(models[:week]).compile()
+        expected, old_secs, old_mb = measure(per_model_predict, models[:week], X)
+        actual, new_secs, new_mb = measure(ensemble.predict, X)
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9)
+        print(f'week {week:>2}: per-model {old_secs * 1000:.0f}ms / {old_mb:.1f}MB peak, '
+              f'compiled {new_secs * 1000:.0f}ms / {new_mb:.1f}MB peak')
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from jobs.data_pulls import weekly_roster_pull, weekly_stats_pull
+from jobs.shared.data_access import collect_streaming, scan_depth_chart, scan_roster, scan_schedule, scan_schedules, \
+    scan_stats_agg
+from jobs.shared.nfl_cache import cache_path
+from jobs.shared.settings import settings
+
+# Runs the stats and roster pulls over synthetic nfl_data files in a throwaway cache, once with every source
+# materialized and each step run eagerly (previous implementation) and once as a single lazy plan on the streaming
+# engine. Each run is its own process so peak RSS covers only that run.
+
+teams = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL', 'DEN', 'DET', 'GB', 'HOU', 'IND', 'JAX', 'KC',
+         'LA', 'LAC', 'LV', 'MIA', 'MIN', 'NE', 'NO', 'NYG', 'NYJ', 'PHI', 'PIT', 'SEA', 'SF', 'TB', 'TEN', 'WAS']
+roster_positions = ['QB', 'RB', 'WR', 'TE', 'FB', 'OL', 'DL', 'LB', 'DB', 'K', 'P']
+stat_cols = ['completions', 'attempts', 'passing_yards', 'passing_tds', 'interceptions', 'sacks', 'sack_yards',
+             'sack_fumbles', 'sack_fumbles_lost', 'passing_air_yards', 'passing_yards_after_catch',
+             'passing_first_downs', 'passing_epa', 'passing_2pt_conversions', 'pacr', 'dakota', 'carries',
+             'rushing_yards', 'rushing_tds', 'rushing_fumbles', 'rushing_fumbles_lost', 'rushing_first_downs',
+             'rushing_epa', 'rushing_2pt_conversions', 'receptions', 'targets', 'receiving_yards', 'receiving_tds',
+             'receiving_fumbles', 'receiving_fumbles_lost', 'receiving_air_yards', 'receiving_yards_after_catch',
+             'receiving_first_downs', 'receiving_epa', 'receiving_2pt_conversions', 'racr', 'target_share',
+             'air_yards_share', 'wopr', 'special_teams_tds', 'fantasy_points', 'fantasy_points_ppr']
+weeks_per_season = 18
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--start_season', type=int, default=2012)
+    parser.add_argument('--seasons', type=int, default=10)
+    parser.add_argument('--players', type=int, default=2000, help='Rostered players per season')
+    parser.add_argument('--week', type=int, default=10, help='Week of the last season the roster pull runs for')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--cache_dir', default=None, help='Reuse synthetic files written by an earlier run')
+    # Internal: set on the child processes that do the measured runs
+    parser.add_argument('--run', choices=['eager_stats', 'lazy_stats', 'eager_roster', 'lazy_roster'])
+    return parser.parse_args()
+
+
+def padding(rng: np.random.Generator, prefix: str, rows: int, n_cols: int) -> dict:
+    # Stands in for the columns nfl_data ships that the pulls never read
+    return {f'{prefix}_extra_{i}': rng.normal(size=rows) if i % 2 else rng.integers(0, 1000, rows).astype(str)
+            for i in range(n_cols)}
+
+
+def make_season(season: int, n_players: int, rng: np.random.Generator) -> dict:
+    player_ids = np.array([f'00-{season % 100:02d}{i:05d}' for i in range(n_players)])
+    player_teams = np.array(teams)[np.arange(n_players) % len(teams)]
+    player_positions = rng.choice(roster_positions, n_players)
+    weeks = np.repeat(np.arange(1, weeks_per_season + 1), n_players)
+    ids, team, position = (np.tile(col, weeks_per_season) for col in (player_ids, player_teams, player_positions))
+    rows = len(weeks)
+
+    rosters = pd.DataFrame(dict(
+        season=season, team=team, position=position, depth_chart_position=position,
+        jersey_number=rng.integers(1, 99, rows), status=rng.choice(['ACT', 'ACT', 'ACT', 'INA', 'RES'], rows),
+        player_name=[f'Player {i}' for i in ids], player_id=ids, years_exp=rng.integers(0, 15, rows).astype(float),
+        week=weeks, entry_year=rng.integers(2000, season + 1, rows).astype(float), weight=rng.integers(170, 330, rows),
+        age=rng.uniform(21, 38, rows), **padding(rng, 'roster', rows, 20)))
+
+    depth_charts = pd.DataFrame(dict(
+        season=season, club_code=team, week=weeks, game_type='REG', depth_team=rng.choice(['1', '2', '3'], rows),
+        gsis_id=ids, position=position, depth_position=np.where(rng.random(rows) < 0.9, position, 'ST'),
+        **padding(rng, 'depth', rows, 8)))
+
+    # Skill players with a stat line in a given week
+    played = rng.random(rows) < 0.35
+    weekly_data = pd.DataFrame(dict(
+        player_id=ids[played], player_display_name=[f'Player {i}' for i in ids[played]], position=position[played],
+        headshot_url='https://example.com/headshot.png', recent_team=team[played], season=season, week=weeks[played],
+        opponent_team=rng.choice(teams, played.sum()),
+        **{col: rng.gamma(1.5, 20.0 if 'yards' in col else 0.5, played.sum()) for col in stat_cols},
+        **padding(rng, 'stats', played.sum(), 10)))
+
+    games = []
+    for week in range(1, weeks_per_season + 1):
+        order = rng.permutation(teams)
+        games.extend((f'{season}_{week:02d}_{away}_{home}', season, week, away, home, f'{home}00', f'{season}{week}')
+                     for away, home in zip(order[::2], order[1::2]))
+    schedules = pd.DataFrame(games, columns=['game_id', 'season', 'week', 'away_team', 'home_team', 'stadium_id',
+                                             'nfl_detail_id'])
+    schedules = pd.concat([schedules, pd.DataFrame(padding(rng, 'schedule', len(schedules), 30))], axis=1)
+
+    return {'weekly_rosters': rosters, 'depth_charts': depth_charts, 'weekly_data': weekly_data,
+            'schedules': schedules}
+
+
+def write_cache(seasons, n_players: int, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    for season in seasons:
+        for dataset, df in make_season(season, n_players, rng).items():
+            path = cache_path(dataset, season)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            df.to_parquet(path, index=False)
+
+
+def stadium_details() -> pl.DataFrame:
+    return pl.DataFrame({'stadium_id': [f'{team}00' for team in teams], 'stadium_name': teams, 'home_team': teams,
+                         'type': ['open'] * len(teams)})
+
+
+def eager_stats(seasons) -> pl.DataFrame:
+    # Previous implementation: every source materialized in full, each step run eagerly
+    stats_df = scan_stats_agg(seasons).collect()
+    schedule_df = scan_schedule(seasons, None).collect()
+    fantasy_df = weekly_stats_pull.filter_down_to_fantasy_positions(stats_df)
+    combined_fumble_df = weekly_stats_pull.combine_fumble_columns(fantasy_df)
+    merged_df = weekly_stats_pull.join_with_schedule_df(combined_fumble_df, schedule_df)
+    depth_df = scan_depth_chart(seasons, None).collect()
+    stats_with_depth_df = weekly_stats_pull.join_stats_with_depth_chart(merged_df, depth_df)
+    roster_df = scan_roster(seasons, None).collect()
+    stats_with_age_df = weekly_stats_pull.join_stats_with_roster(stats_with_depth_df, roster_df)
+    return weekly_stats_pull.select_output_cols(stats_with_age_df)
+
+
+def eager_roster(season: int, week: int) -> pl.DataFrame:
+    active_players_df = weekly_roster_pull.filter_to_active_players(scan_roster([season], week).collect())
+    top_depth_df = weekly_roster_pull.filter_depth_chart(scan_depth_chart([season], week).collect())
+    opponent_with_stadium_df = weekly_roster_pull.join_stadium_details_to_roster_data(
+        scan_schedules(season, week).collect(), stadium_details())
+    roster_filtered_by_depth_df = weekly_roster_pull.join_roster_with_depth_chart(active_players_df, top_depth_df)
+    roster_with_opponent_df = weekly_roster_pull.join_roster_with_schedule(roster_filtered_by_depth_df,
+                                                                           opponent_with_stadium_df)
+    return weekly_roster_pull.select_output_cols(roster_with_opponent_df)
+
+
+def run_one(args) -> None:
+    seasons = list(range(args.start_season, args.start_season + args.seasons))
+    runs = {
+        'eager_stats': lambda: eager_stats(seasons),
+        'lazy_stats': lambda: weekly_stats_pull.build_stats(seasons),
+        'eager_roster': lambda: eager_roster(seasons[-1], args.week),
+        'lazy_roster': lambda: collect_streaming(
+            weekly_roster_pull.build_roster_plan(seasons[-1], args.week, stadium_details()), 'weekly_roster_pull'),
+    }
+    start = time.perf_counter()
+    df = runs[args.run]()
+    secs = time.perf_counter() - start
+    # Order independent fingerprint so eager and lazy outputs can be compared across processes
+    checksum = int(df.hash_rows(seed=0).to_numpy().sum(dtype=np.uint64))
+    print(json.dumps({'secs': secs, 'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+                      'rows': len(df), 'checksum': checksum}))
+
+
+def measure(run: str, args, cache_dir: str) -> dict:
+    env = dict(os.environ, NFL_CACHE_DIR=cache_dir, NFL_DATA_OFFLINE='true', LOG_QUERY_PLANS='false')
+    cmd = [sys.executable, '-m', 'benchmarks.bench_lazy_pulls', '--run', run,
+           '--start_season', str(args.start_season), '--seasons', str(args.seasons), '--week', str(args.week)]
+    output = subprocess.check_output(cmd, env=env, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    if args.run is not None:
+        run_one(args)
+        sys.exit()
+
+    cache_dir = args.cache_dir or tempfile.mkdtemp(prefix='bench_lazy_pulls_')
+    settings.NFL_CACHE_DIR = cache_dir
+    if args.cache_dir is None:
+        write_cache(range(args.start_season, args.start_season + args.seasons), args.players, args.seed)
+
+    print(f'seasons: {args.seasons}, players: {args.players}, cache: {cache_dir}')
+    for pull in ['stats', 'roster']:
+        eager = measure(f'eager_{pull}', args, cache_dir)
+        lazy = measure(f'lazy_{pull}', args, cache_dir)
+        assert (eager['rows'], eager['checksum']) == (lazy['rows'], lazy['checksum']), f'{pull} outputs differ'
+        print(f'{pull:>6}: eager {eager["secs"] * 1000:.0f}ms / {eager["peak_rss_mb"]:.0f}MB peak, '
+              f'lazy streaming {lazy["secs"] * 1000:.0f}ms / {lazy["peak_rss_mb"]:.0f}MB peak '
+              f'({eager["secs"] / lazy["secs"]:.1f}x, rows {lazy["rows"]})')
@@ -0,0 +1,69 @@
+import argparse
+import time
+
+import numpy as np
+import polars as pl
+
+from jobs.shared.points_calc import calculate_fantasy_points, calculate_fantasy_points_np, score_configs, \
+    scoring_cols
+from jobs.shared.points_config import STANDARD_PPR, STANDARD_HALF_PPR, DK_DFS
+
+
+default_league_configs = {'full_ppr': STANDARD_PPR,
+                          'half_ppr': STANDARD_HALF_PPR,
+                          'dk_dfs': DK_DFS}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=42)
+    return parser.parse_args()
+
+
+def make_predictions_base(rows: int, seed: int) -> pl.DataFrame:
+    rng = np.random.default_rng(seed)
+    df = pl.DataFrame({col: rng.gamma(1.5, 20.0 if 'yards' in col else 0.5, rows) for col in scoring_cols})
+    return df.with_columns(pl.Series('player_id', [f'00-{i:07d}' for i in range(rows)]),
+                           pl.lit(2024).alias('season'),
+                           pl.lit(1).alias('week'))
+
+
+def map_elements_scoring(df: pl.DataFrame) -> pl.DataFrame:
+    # Previous implementation: one python call per row per config
+    out = df.select('player_id', 'season', 'week')
+    for name, pc in default_league_configs.items():
+        out = out.with_columns(df.select(pl.struct(*scoring_cols).map_elements(
+            lambda x: calculate_fantasy_points(pc, x['passing_yards'], x['passing_tds'],
+                                               x['interceptions'], x['receptions'], x['receiving_yards'],
+                                               x['receiving_tds'], x['rushing_yards'], x['rushing_tds'],
+                                               x['fumbles'], x['rushing_2pt_conversions'],
+                                               x['receiving_2pt_conversions'], x['passing_2pt_conversions']),
+            return_dtype=pl.Float64).alias(name)))
+    return out
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    df = make_predictions_base(args.rows, args.seed)
+    pd_df = df.to_pandas()
+
+    baseline_df, baseline_secs = timed(map_elements_scoring, df)
+    vectorized_df, vectorized_secs = timed(score_configs, df, default_league_configs)
+    numpy_results, numpy_secs = timed(lambda: {name: calculate_fantasy_points_np(pc, pd_df)
+                                               for name, pc in default_league_configs.items()})
+
+    for name in default_league_configs:
+        np.testing.assert_allclose(vectorized_df[name].to_numpy(), baseline_df[name].to_numpy())
+        np.testing.assert_allclose(numpy_results[name], baseline_df[name].to_numpy())
+
+    print(f'rows: {args.rows}, configs: {len(default_league_configs)}')
+    print(f'map_elements: {baseline_secs:.3f}s')
+    print(f'polars expr:  {vectorized_secs:.3f}s ({baseline_secs / vectorized_secs:.0f}x)')
+    print(f'numpy:        {numpy_secs:.3f}s ({baseline_secs / numpy_secs:.0f}x)')
@@ -1,8 +1,10 @@
+from jobs.shared.bulk_load import bulk_load
 from jobs.shared.data_access import pull_schedule
+from jobs.shared.profiling import profiled
+from jobs.shared.schedule_calendar import invalidate_schedule_calendar
 import polars as pl
 
 from jobs.shared.logging_config import logger
-from jobs.shared.settings import settings
 
 
 def select_output_cols(df: pl.DataFrame) -> pl.DataFrame:
@@ -10,18 +12,18 @@ def select_output_cols(df: pl.DataFrame) -> pl.DataFrame:
                      'gametime', 'weekday', 'home_team', 'away_team')
 
 
-def insert_to_db(df: pl.DataFrame) -> None:
-    df.write_database(
-        table_name='schedule',
-        connection=settings.POSTGRES_CONN_STRING,
-        if_table_exists='replace'
-    )
+@profiled
+def insert_to_db(df: pl.DataFrame, season: int) -> None:
+    # Only replace the season being populated so earlier seasons' schedules stay queryable
+    bulk_load(df, 'schedule', delete_where={'season': season})
+    invalidate_schedule_calendar()
 
 
+@profiled
 def main(season: int):
 
-    logger.info(f'Running populate_schedule for season {season} and week {week}')
+    logger.info(f'Running populate_schedule for season {season}')
 
     schedule_df = pull_schedule([season], None)
     output_df = select_output_cols(schedule_df)
-    insert_to_db(output_df)
+    insert_to_db(output_df, season)
@@ -0,0 +1,72 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import List, Set
+
+from sqlalchemy import text
+
+from jobs.data_pulls import weekly_stats_pull
+from jobs.shared.db import get_engine
+from jobs.shared.logging_config import logger
+from jobs.shared.nfl_cache import current_nfl_season
+from jobs.shared.profiling import profiled
+from jobs.shared.settings import settings
+
+job_name = 'weekly_stats'
+
+
+def read_completed_seasons() -> Set[int]:
+    with get_engine().connect() as conn:
+        rows = conn.execute(text('select season from backfill_progress where job_name = :job_name'),
+                            {'job_name': job_name})
+        return {row.season for row in rows}
+
+
+def mark_season_completed(season: int, row_count: int) -> None:
+    with get_engine().begin() as conn:
+        conn.execute(text('''
+            insert into backfill_progress (job_name, season, row_count, completed_at)
+            values (:job_name, :season, :row_count, now())
+            on conflict (job_name, season) do update set row_count = excluded.row_count, completed_at = now()
+        '''), {'job_name': job_name, 'season': season, 'row_count': row_count})
+
+
+@profiled
+def fetch_season(season: int):
+    logger.info(f'Fetching stats for season {season}')
+    return weekly_stats_pull.build_stats([season])
+
+
+@profiled
+def main(seasons: List[int], restart: bool = False):
+    # Seasons are fetched on a bounded pool, at most NFL_FETCH_WORKERS ahead of the one being written, and each is
+    # written (and recorded in backfill_progress) before its frame is dropped, so memory stays bounded however many
+    # seasons are asked for and a failed run picks up after the last season it finished
+    # A season still being played is never done, it's re-pulled every run so weeks played since keep landing
+    current_season = current_nfl_season()
+    completed = set() if restart else {season for season in read_completed_seasons() if season < current_season}
+    pending = [season for season in sorted(seasons) if season not in completed]
+    if completed & set(seasons):
+        logger.info(f'Skipping already backfilled seasons {sorted(completed & set(seasons))}')
+    if not pending:
+        return
+
+    workers = max(1, min(settings.NFL_FETCH_WORKERS, len(pending)))
+    remaining = iter(pending)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        in_flight = deque((season, pool.submit(fetch_season, season)) for season in islice(remaining, workers))
+        while in_flight:
+            season, future = in_flight.popleft()
+            season_df = future.result()
+            next_season = next(remaining, None)
+            if next_season is not None:
+                in_flight.append((next_season, pool.submit(fetch_season, next_season)))
+
+            weekly_stats_pull.insert_to_db(season_df)
+            if season < current_season:
+                mark_season_completed(season, len(season_df))
+            logger.info(f'Backfilled season {season} ({len(season_df)} rows)')
+            del season_df
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
@@ -1,34 +1,42 @@
+from datetime import datetime, timezone
+
 import numpy as np
 import pandas as pd
 import polars as pl
 
+from jobs.shared.bulk_load import load_frame
 from jobs.shared.constants import accuracy_cols
+from jobs.shared.db import get_engine
 from jobs.shared.logging_config import logger
-from jobs.shared.settings import settings
+from jobs.shared.profiling import profiled
 
 
+@profiled
 def read_weekly_predictions(season: int, week: int) -> pl.DataFrame:
     df = pd.read_sql(
         sql=f'select * from weekly_predictions_base where season = {season} and week = {week}',
-        con=settings.POSTGRES_CONN_STRING
+        con=get_engine()
     )
     if len(df) == 0:
         raise ValueError(f'No predictions found for season {season} and week {week}')
     return pl.from_pandas(df)
 
 
+@profiled
 def read_half_ppr_predictions(season: int, week: int) -> pl.DataFrame:
     df = pd.read_sql(
-        sql=f'select * from weekly_predictions_std_half_ppr where season = {season} and week = {week}',
-        con=settings.POSTGRES_CONN_STRING
+        sql=f"select player_id, season, week, fantasy_points from weekly_fantasy_points "
+            f"where season = {season} and week = {week} and scoring_format = 'half_ppr'",
+        con=get_engine()
     )
     return pl.from_pandas(df)
 
 
+@profiled
 def read_weekly_actuals(season: int, week: int) -> pl.DataFrame:
     df = pd.read_sql(
         sql=f'select * from weekly_stats where season = {season} and week = {week}',
-        con=settings.POSTGRES_CONN_STRING
+        con=get_engine()
     )
     return pl.from_pandas(df)
 
@@ -82,22 +90,25 @@ def calculate_accuracy_metrics(df: pl.DataFrame, season: int, week: int) -> pl.D
     return metrics_df
 
 
-def write_predictions_diffs(df: pl.DataFrame):
-    df.write_database(
-        table_name='prediction_diffs',
-        connection=settings.POSTGRES_CONN_STRING,
-        if_table_exists='append'
-    )
+def build_completed_week(diff_df: pl.DataFrame, metrics_df: pl.DataFrame) -> pl.DataFrame:
+    # One row per completed week with its metrics, so the accuracy landing page reads a tiny table instead of
+    # scanning prediction_diffs
+    return metrics_df.with_columns(pl.lit(len(diff_df)).alias('player_count'),
+                                   pl.lit(datetime.now(timezone.utc)).alias('computed_at'))
 
 
-def write_accuracy_metrics(df: pl.DataFrame):
-    df.write_database(
-        table_name='accuracy_metrics',
-        connection=settings.POSTGRES_CONN_STRING,
-        if_table_exists='append'
-    )
+@profiled
+def write_accuracy(diff_df: pl.DataFrame, metrics_df: pl.DataFrame, season: int, week: int):
+    # Diffs, metrics and the completed week summary land together, replacing the week so a rerun doesn't collide
+    # with the primary keys
+    delete_where = {'season': season, 'week': week}
+    with get_engine().begin() as conn:
+        load_frame(conn, diff_df, 'prediction_diffs', delete_where)
+        load_frame(conn, metrics_df, 'accuracy_metrics', delete_where)
+        load_frame(conn, build_completed_week(diff_df, metrics_df), 'completed_weeks', delete_where)
 
 
+@profiled
 def main(season: int, week: int):
     logger.info(f'Running weekly accuracy calculation for season {season} and week {week}')
 
@@ -110,5 +121,4 @@ def main(season: int, week: int):
     diff_df = calculate_differences(merged_df)
     metrics_df = calculate_accuracy_metrics(diff_df, season, week)
 
-    write_predictions_diffs(diff_df)
-    write_accuracy_metrics(metrics_df)
+    write_accuracy(diff_df, metrics_df, season, week)
@@ -2,20 +2,22 @@ import pandas as pd
 import polars as pl
 
 from jobs.shared.constants import positions
-from jobs.shared.data_access import pull_schedules, pull_depth_chart, pull_roster, upsert_to_db
+from jobs.shared.data_access import collect_streaming, scan_schedules, scan_depth_chart, scan_roster, upsert_to_db
+from jobs.shared.db import get_engine
 from jobs.shared.logging_config import logger
-from jobs.shared.settings import settings
+from jobs.shared.profiling import profiled
 
 
+@profiled
 def read_stadium_details() -> pl.DataFrame:
     df = pd.read_sql(
         sql=f'select * from stadium_details',
-        con=settings.POSTGRES_CONN_STRING
+        con=get_engine()
     )
     return pl.from_pandas(df)
 
 
-def filter_depth_chart(df: pl.DataFrame) -> pl.DataFrame:
+def filter_depth_chart(df: pl.LazyFrame) -> pl.LazyFrame:
     qbs = df.filter(pl.col('position') == 'QB') \
             .filter(pl.col('depth_ranking') <= 1)
 
@@ -31,21 +33,21 @@ def filter_depth_chart(df: pl.DataFrame) -> pl.DataFrame:
     return pl.concat(items=[qbs, rbs, wrs, tes])
 
 
-def join_stadium_details_to_roster_data(roster_df: pl.DataFrame, stadium_df: pl.DataFrame) -> pl.DataFrame:
+def join_stadium_details_to_roster_data(roster_df: pl.LazyFrame, stadium_df: pl.LazyFrame) -> pl.LazyFrame:
     return roster_df.join(stadium_df.drop('stadium_name', 'home_team'), on='stadium_id')
 
 
-def filter_to_active_players(df: pl.DataFrame) -> pl.DataFrame:
+def filter_to_active_players(df: pl.LazyFrame) -> pl.LazyFrame:
     return df.filter(pl.col('status') == 'ACT') \
              .filter(pl.col('position').is_in(positions))
 
 
-def join_roster_with_depth_chart(roster_df: pl.DataFrame, depth_df: pl.DataFrame) -> pl.DataFrame:
+def join_roster_with_depth_chart(roster_df: pl.LazyFrame, depth_df: pl.LazyFrame) -> pl.LazyFrame:
     depth_df = depth_df.select('gsis_id', 'depth_ranking')
     return roster_df.join(depth_df, left_on='player_id', right_on='gsis_id', how='inner')
 
 
-def join_roster_with_schedule(roster_df: pl.DataFrame, opponents_df: pl.DataFrame) -> pl.DataFrame:
+def join_roster_with_schedule(roster_df: pl.LazyFrame, opponents_df: pl.LazyFrame) -> pl.LazyFrame:
     matchups_df = opponents_df.select(['home_team', 'away_team'])
     matchups2_df = matchups_df.rename({'home_team': 'home_team_2', 'away_team': 'away_team_2'})
 
@@ -62,30 +64,37 @@ def join_roster_with_schedule(roster_df: pl.DataFrame, opponents_df: pl.DataFram
                     .drop('away_team', 'home_team_2')
 
 
-def select_output_cols(df: pl.DataFrame) -> pl.DataFrame:
-    return df.select('season', 'week', 'position', 'status', 'player_id', 'player_name', 'age', 'team',
-                     'opponent', 'home_away', 'depth_ranking')
+def select_output_cols(df: pl.LazyFrame) -> pl.LazyFrame:
+    # age is REAL in weekly_roster, matching it here means downstream stages see what a reader of the table would
+    return df.select('season', 'week', 'position', 'status', 'player_id', 'player_name',
+                     pl.col('age').cast(pl.Float32), 'team', 'opponent', 'home_away', 'depth_ranking')
 
 
-def main(season: int, week: int):
-
-    logger.info(f'Running weekly_roster_pull for season {season} and week {week}')
-
+def build_roster_plan(season: int, week: int, stadium_details_df: pl.DataFrame) -> pl.LazyFrame:
     # weekly roster prep
-    weekly_roster_df = pull_roster([season], week)
-    active_players_df = filter_to_active_players(weekly_roster_df)
+    weekly_roster_lf = scan_roster([season], week)
+    active_players_lf = filter_to_active_players(weekly_roster_lf)
 
     # depth chart prep
-    depth_df = pull_depth_chart([season], week)
-    top_depth_df = filter_depth_chart(depth_df)
+    depth_lf = scan_depth_chart([season], week)
+    top_depth_lf = filter_depth_chart(depth_lf)
 
     # opponent prep
-    opponent_df = pull_schedules(season, week)
-    stadium_details_df = read_stadium_details()
-    opponent_with_stadium_df = join_stadium_details_to_roster_data(opponent_df, stadium_details_df)
+    opponent_lf = scan_schedules(season, week)
+    opponent_with_stadium_lf = join_stadium_details_to_roster_data(opponent_lf, stadium_details_df.lazy())
 
     # combine them
-    roster_filtered_by_depth_df = join_roster_with_depth_chart(active_players_df, top_depth_df)
-    roster_with_opponent_df = join_roster_with_schedule(roster_filtered_by_depth_df, opponent_with_stadium_df)
-    output_df = select_output_cols(roster_with_opponent_df)
+    roster_filtered_by_depth_lf = join_roster_with_depth_chart(active_players_lf, top_depth_lf)
+    roster_with_opponent_lf = join_roster_with_schedule(roster_filtered_by_depth_lf, opponent_with_stadium_lf)
+    return select_output_cols(roster_with_opponent_lf)
+
+
+@profiled
+def main(season: int, week: int) -> pl.DataFrame:
+
+    logger.info(f'Running weekly_roster_pull for season {season} and week {week}')
+
+    plan = build_roster_plan(season, week, read_stadium_details())
+    output_df = collect_streaming(plan, 'weekly_roster_pull')
     upsert_to_db(output_df, 'weekly_roster', season, week)
+    return output_df
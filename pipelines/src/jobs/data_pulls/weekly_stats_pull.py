@@ -2,12 +2,13 @@ from typing import List
 
 import polars as pl
 
-from jobs.shared.data_access import pull_depth_chart, pull_roster, pull_schedule, pull_stats_agg
+from jobs.shared.bulk_load import upsert_frame
+from jobs.shared.data_access import collect_streaming, scan_depth_chart, scan_roster, scan_schedule, scan_stats_agg
 from jobs.shared.logging_config import logger
-from jobs.shared.settings import settings
+from jobs.shared.profiling import profiled
 
 
-def filter_down_to_fantasy_positions(df: pl.DataFrame) -> pl.DataFrame:
+def filter_down_to_fantasy_positions(df: pl.LazyFrame) -> pl.LazyFrame:
     positions = ['FB', 'TE', 'QB', 'WR', 'RB']
     return df.filter(pl.col('position').is_in(positions)) \
              .with_columns(pl.when(pl.col('position') == 'FB')
@@ -16,13 +17,13 @@ def filter_down_to_fantasy_positions(df: pl.DataFrame) -> pl.DataFrame:
                                           .alias('position'))
 
 
-def combine_fumble_columns(df: pl.DataFrame) -> pl.DataFrame:
+def combine_fumble_columns(df: pl.LazyFrame) -> pl.LazyFrame:
     return df.with_columns((pl.col('sack_fumbles_lost') +
                             pl.col('rushing_fumbles_lost') +
                             pl.col('receiving_fumbles_lost')).alias('fumbles'))
 
 
-def join_with_schedule_df(stats_df: pl.DataFrame, sched_df: pl.DataFrame):
+def join_with_schedule_df(stats_df: pl.LazyFrame, sched_df: pl.LazyFrame) -> pl.LazyFrame:
     stats_df = stats_df.with_columns([
         pl.col("season").cast(pl.Int64),
         pl.col("week").cast(pl.Int64)
@@ -54,7 +55,7 @@ def join_with_schedule_df(stats_df: pl.DataFrame, sched_df: pl.DataFrame):
     return merged_df
 
 
-def join_stats_with_depth_chart(stats_df: pl.DataFrame, depth_df: pl.DataFrame) -> pl.DataFrame:
+def join_stats_with_depth_chart(stats_df: pl.LazyFrame, depth_df: pl.LazyFrame) -> pl.LazyFrame:
     depth_df = depth_df.select(pl.col('gsis_id').alias('player_id'),
                                'depth_ranking',
                                pl.col('week').cast(pl.Int64).alias('week'),
@@ -62,7 +63,7 @@ def join_stats_with_depth_chart(stats_df: pl.DataFrame, depth_df: pl.DataFrame)
     return stats_df.join(depth_df, on=['player_id', 'week', 'season'])
 
 
-def join_stats_with_roster(stats_df: pl.DataFrame, roster_df: pl.DataFrame) -> pl.DataFrame:
+def join_stats_with_roster(stats_df: pl.LazyFrame, roster_df: pl.LazyFrame) -> pl.LazyFrame:
     join_keys = ['season', 'week', 'player_id']
     roster_df = roster_df.with_columns(pl.col('season').cast(pl.Int64)) \
                          .with_columns(pl.col('week').cast(pl.Int64)) \
@@ -71,7 +72,7 @@ def join_stats_with_roster(stats_df: pl.DataFrame, roster_df: pl.DataFrame) -> p
 
 
 
-def select_output_cols(df: pl.DataFrame) -> pl.DataFrame:
+def select_output_cols(df: pl.LazyFrame) -> pl.LazyFrame:
     return df.select(
         'player_id', 'player_display_name', 'position', 'headshot_url', pl.col('recent_team').alias('team'),
         'season', 'week', pl.col('opponent_team').alias('opponent'), 'home_away', 'age', 'completions', 'attempts',
@@ -85,26 +86,35 @@ def select_output_cols(df: pl.DataFrame) -> pl.DataFrame:
     )
 
 
+@profiled
 def insert_to_db(df: pl.DataFrame) -> None:
-    df.write_database(
-        table_name='weekly_stats',
-        connection=settings.POSTGRES_CONN_STRING,
-        if_table_exists='append'
-    )
+    # Incremental, only new or corrected stat lines are written so reruns never duplicate a player's week
+    upsert_frame(df, 'weekly_stats', key_cols=['season', 'week', 'player_id'])
+
+
+def build_stats_plan(seasons: List[int], week: int = None) -> pl.LazyFrame:
+    stats_lf = scan_stats_agg(seasons, week)
+    schedule_lf = scan_schedule(seasons, week)
+    fantasy_lf = filter_down_to_fantasy_positions(stats_lf)
+    combined_fumble_lf = combine_fumble_columns(fantasy_lf)
+    merged_lf = join_with_schedule_df(combined_fumble_lf, schedule_lf)
+    depth_lf = scan_depth_chart(seasons, week)
+    stats_with_depth_lf = join_stats_with_depth_chart(merged_lf, depth_lf)
+
+    roster_lf = scan_roster(seasons, week)
+    stats_with_age_lf = join_stats_with_roster(stats_with_depth_lf, roster_lf)
+    return select_output_cols(stats_with_age_lf)
+
+
+@profiled
+def build_stats(seasons: List[int], week: int = None) -> pl.DataFrame:
+    return collect_streaming(build_stats_plan(seasons, week), 'weekly_stats_pull')
+
 
+@profiled
 def main(seasons: List[int], week: int = None):
 
     logger.info(f'Running weekly_stats_pull for season {seasons} and week {week}')
 
-    stats_df = pull_stats_agg(seasons, week)
-    schedule_df = pull_schedule(seasons, week)
-    fantasy_df = filter_down_to_fantasy_positions(stats_df)
-    combined_fumble_df = combine_fumble_columns(fantasy_df)
-    merged_df = join_with_schedule_df(combined_fumble_df, schedule_df)
-    depth_df = pull_depth_chart(seasons, week)
-    stats_with_depth_df = join_stats_with_depth_chart(merged_df, depth_df)
-
-    roster_df = pull_roster(seasons, week)
-    stats_with_age_df = join_stats_with_roster(stats_with_depth_df, roster_df)
-    final_df = select_output_cols(stats_with_age_df)
+    final_df = build_stats(seasons, week)
     insert_to_db(final_df)
@@ -3,19 +3,25 @@ import pandas as pd
 import polars as pl
 from mlflow import MlflowClient
 
+from jobs.ml.model_cache import load_registered_model
 from jobs.shared.constants import cat_features, model_prediction_vars, numerical_features
+from jobs.shared.bulk_load import bulk_load
 from jobs.shared.data_access import upsert_to_db
+from jobs.shared.db import get_engine
 from jobs.shared.logging_config import logger
+from jobs.shared.profiling import profiled
 from jobs.shared.settings import settings
 
 
+@profiled
 def read_weekly_roster(season: int, week: int) -> pd.DataFrame:
     return pd.read_sql(
         sql=f'select * from weekly_roster where season = {season} and week = {week}',
-        con=settings.POSTGRES_CONN_STRING
+        con=get_engine()
     )
 
 
+@profiled
 def load_model_and_preprocessor():
     mlflow.set_tracking_uri(settings.MLFLOW_TRACKING_URI)
     client = MlflowClient()
@@ -26,12 +32,13 @@ def load_model_and_preprocessor():
     model_version = client.get_latest_versions(model_name, stages=["None"])[0].version
     preprocessor_version = client.get_latest_versions(preprocessor_name, stages=["None"])[0].version
 
-    model = mlflow.sklearn.load_model(f'models:/{model_name}/{model_version}')
-    preprocessor = mlflow.sklearn.load_model(f'models:/{preprocessor_name}/{preprocessor_version}')
+    model = load_registered_model(model_name, model_version)
+    preprocessor = load_registered_model(preprocessor_name, preprocessor_version)
 
     return model, preprocessor
 
 
+@profiled
 def create_predictions(df: pd.DataFrame, model, preprocessor):
     preprocessed_df = preprocessor.transform(df)
     return model.predict(preprocessed_df)
@@ -60,23 +67,22 @@ def create_final_predictions_df(pred_df: pd.DataFrame, roster_df: pd.DataFrame,
 
 
 def insert_to_db(df: pd.DataFrame) -> None:
-    pl_df = pl.from_pandas(df)
-    pl_df.write_database(
-        table_name='weekly_predictions_base',
-        connection=settings.POSTGRES_CONN_STRING,
-        if_table_exists='append'
-    )
+    bulk_load(pl.from_pandas(df), 'weekly_predictions_base')
 
 
-def main(season: int, week: int):
+@profiled
+def main(season: int, week: int, roster_df: pl.DataFrame = None, model=None, preprocessor=None) -> pl.DataFrame:
 
     logger.info(f'Running batch prediction for season {season} and week {week}')
     mlflow.set_tracking_uri(settings.MLFLOW_TRACKING_URI)
 
-    df = read_weekly_roster(season, week)
+    # The roster and model are handed over in memory when run as part of the ML pipeline
+    df = roster_df.to_pandas() if roster_df is not None else read_weekly_roster(season, week)
     subset_df = df[cat_features + numerical_features]
-    model, preprocessor = load_model_and_preprocessor()
+    if model is None or preprocessor is None:
+        model, preprocessor = load_model_and_preprocessor()
     predictions = create_predictions(subset_df, model, preprocessor)
     formatted_predictions = format_predictions(predictions, subset_df, model_prediction_vars)
-    final_df = create_final_predictions_df(formatted_predictions, df, season, week)
-    upsert_to_db(pl.from_pandas(final_df), 'weekly_predictions_base', season, week)
+    final_df = pl.from_pandas(create_final_predictions_df(formatted_predictions, df, season, week))
+    upsert_to_db(final_df, 'weekly_predictions_base', season, week)
+    return final_df
@@ -2,54 +2,47 @@ import pandas as pd
 import polars as pl
 
 from jobs.shared.data_access import upsert_to_db
+from jobs.shared.db import get_engine
 from jobs.shared.logging_config import logger
-from jobs.shared.points_calc import calculate_fantasy_points
-from jobs.shared.points_config import PointsConfig, STANDARD_PPR, STANDARD_HALF_PPR, DK_DFS
-from jobs.shared.settings import settings
+from jobs.shared.points_calc import score_configs
+from jobs.shared.points_config import STANDARD_PPR, STANDARD_HALF_PPR, DK_DFS
+from jobs.shared.profiling import profiled
 
 
+@profiled
 def read_weekly_predictions_base(season: int, week: int) -> pl.DataFrame:
     # Would use pl.read_database_uri but that depends on connectorx which can't run in docker right now
     df = pd.read_sql(
         sql=f"select * from weekly_predictions_base where season = {season} and week = {week}",
-        con=settings.POSTGRES_CONN_STRING
+        con=get_engine()
     )
     return pl.from_pandas(df)
 
 
 
-def calculate_fantasy_points_for_default_configs(df: pl.DataFrame, points_config: PointsConfig) -> pl.DataFrame:
-    return df.with_columns(pl.struct('passing_yards', 'passing_tds', 'interceptions', 'receptions',
-                                     'receiving_yards','receiving_tds', 'rushing_yards', 'rushing_tds',
-                                     'fumbles', 'rushing_2pt_conversions', 'receiving_2pt_conversions',
-                                     'passing_2pt_conversions') \
-                    .map_elements(
-        lambda x: calculate_fantasy_points(points_config, x['passing_yards'], x['passing_tds'],
-                                           x['interceptions'], x['receptions'], x['receiving_yards'],
-                                           x['receiving_tds'], x['rushing_yards'], x['rushing_tds'],
-                                           x['fumbles'], x['rushing_2pt_conversions'], x['receiving_2pt_conversions'],
-                                           x['passing_2pt_conversions']),
-        return_dtype=pl.Float64).alias('fantasy_points')) \
-             .select('player_id', 'season', 'week', 'fantasy_points')
-
-
-def insert_to_db(df: pl.DataFrame, table_name: str) -> None:
-    df = df.select('player_id', 'season', 'week', 'fantasy_points')
-    df.write_database(
-        table_name=table_name,
-        connection=settings.POSTGRES_CONN_STRING,
-        if_table_exists='append'
-    )
+def to_long_format(scored_df: pl.DataFrame, scoring_formats) -> pl.DataFrame:
+    return scored_df.unpivot(index=['player_id', 'season', 'week'], on=list(scoring_formats),
+                             variable_name='scoring_format', value_name='fantasy_points') \
+                    .select('season', 'week', 'scoring_format', 'player_id', 'fantasy_points')
+
+
+def insert_to_db(df: pl.DataFrame, season: int, week: int) -> None:
+    # Every scoring format for the week goes in as one load
+    upsert_to_db(df, 'weekly_fantasy_points', season, week)
 
 
-def main(season: int, week: int):
+@profiled
+def main(season: int, week: int, predictions_df: pl.DataFrame = None) -> pl.DataFrame:
 
     logger.info(f'Running fantasy points calculation for season {season} and week {week}')
 
-    default_league_configs = [(STANDARD_PPR, 'weekly_predictions_std_full_ppr'),
-                              (STANDARD_HALF_PPR, 'weekly_predictions_std_half_ppr'),
-                              (DK_DFS, 'weekly_predictions_dk_dfs')]
-    predictions_df = read_weekly_predictions_base(season, week)
-    for config in default_league_configs:
-        fantasy_points_df = calculate_fantasy_points_for_default_configs(predictions_df, config[0])
-        upsert_to_db(fantasy_points_df, config[1], season, week)
+    default_league_configs = {'full_ppr': STANDARD_PPR,
+                              'half_ppr': STANDARD_HALF_PPR,
+                              'dk_dfs': DK_DFS}
+    if predictions_df is None:
+        predictions_df = read_weekly_predictions_base(season, week)
+    # score every config in one pass then write them all together
+    scored_df = score_configs(predictions_df, default_league_configs)
+    long_df = to_long_format(scored_df, default_league_configs)
+    insert_to_db(long_df, season, week)
+    return long_df
@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, Tuple
+
+import mlflow.artifacts
+import mlflow.sklearn
+
+from jobs.shared.logging_config import logger
+from jobs.shared.settings import settings
+
+# Loaded models for long lived workers, keyed by (registered model name, version)
+_loaded_models: Dict[Tuple[str, str], object] = {}
+
+
+def dir_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, file_name))
+               for root, _, file_names in os.walk(path) for file_name in file_names)
+
+
+def evict_least_recently_used(cache_dir: str, max_bytes: int, keep: str) -> None:
+    # Dot entries are downloads still in progress
+    entries = [os.path.join(cache_dir, name, version)
+               for name in os.listdir(cache_dir) if not name.startswith('.')
+               for version in os.listdir(os.path.join(cache_dir, name))]
+    sizes = {entry: dir_size(entry) for entry in entries}
+    total = sum(sizes.values())
+    # mtime is bumped on every use, so oldest mtime is least recently used
+    for entry in sorted(entries, key=os.path.getmtime):
+        if total <= max_bytes:
+            break
+        if entry == keep:
+            continue
+        logger.info(f'Evicting cached model artifacts {entry}')
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= sizes[entry]
+
+
+def download_model(name: str, version: str) -> str:
+    cache_dir = settings.MODEL_CACHE_DIR
+    local_path = os.path.join(cache_dir, name, str(version))
+    if os.path.exists(local_path):
+        os.utime(local_path)
+        return local_path
+
+    # Own staging dir per download, so processes missing the same version at once don't clobber each other
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    tmp_path = tempfile.mkdtemp(dir=cache_dir, prefix='.download-')
+    try:
+        downloaded = mlflow.artifacts.download_artifacts(artifact_uri=f'models:/{name}/{version}', dst_path=tmp_path)
+        try:
+            os.replace(downloaded, local_path)
+        except OSError:
+            # Another process finished the same download first, use theirs
+            if not os.path.exists(local_path):
+                raise
+            logger.info(f'{name} version {version} was cached by another process meanwhile')
+            return local_path
+    finally:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+    evict_least_recently_used(cache_dir, settings.MODEL_CACHE_MAX_BYTES, keep=local_path)
+    return local_path
+
+
+def load_registered_model(name: str, version: str):
+    start = time.perf_counter()
+    key = (name, str(version))
+    if settings.MODEL_CACHE_IN_PROCESS and key in _loaded_models:
+        logger.info(f'Loaded {name} version {version} from memory (cache hit) in {time.perf_counter() - start:.2f}s')
+        return _loaded_models[key]
+
+    if settings.MODEL_CACHE_DIR:
+        hit = os.path.exists(os.path.join(settings.MODEL_CACHE_DIR, name, str(version)))
+        model = mlflow.sklearn.load_model(download_model(name, version))
+        source = 'disk (cache hit)' if hit else 'registry (cache miss)'
+    else:
+        model = mlflow.sklearn.load_model(f'models:/{name}/{version}')
+        source = 'registry'
+
+    if settings.MODEL_CACHE_IN_PROCESS:
+        # Only the latest version of each model is ever served, drop the ones it replaces
+        for stale_key in [k for k in _loaded_models if k[0] == name]:
+            del _loaded_models[stale_key]
+        _loaded_models[key] = model
+
+    logger.info(f'Loaded {name} version {version} from {source} in {time.perf_counter() - start:.2f}s')
+    return model
@@ -0,0 +1,42 @@
+import os
+from typing import Optional
+
+import joblib
+
+from jobs.shared.logging_config import logger
+
+
+def week_model_key(season: int, week: int, train_fingerprint: str, model_params: dict) -> str:
+    return joblib.hash((season, week, train_fingerprint, sorted(model_params.items())))
+
+
+class WeekModelStore:
+    # Fitted per-week models on disk, laid out as {store_dir}/{season}/week_{week}_{key}.joblib
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+
+    def _path(self, season: int, week: int, key: str) -> str:
+        return os.path.join(self.store_dir, str(season), f'week_{week}_{key}.joblib')
+
+    def load(self, season: int, week: int, key: str) -> Optional[dict]:
+        path = self._path(season, week, key)
+        if not os.path.exists(path):
+            return None
+        try:
+            return joblib.load(path)
+        except Exception as e:
+            logger.warning(f'Could not load cached model {path}, retraining: {e}')
+            return None
+
+    def save(self, season: int, week: int, key: str, entry: dict) -> None:
+        path = self._path(season, week, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        joblib.dump(entry, tmp_path)
+        os.replace(tmp_path, path)
+
+        # Anything else stored for this season / week was trained on data or params that no longer apply
+        prefix = f'week_{week}_'
+        for file_name in os.listdir(os.path.dirname(path)):
+            if file_name.startswith(prefix) and file_name != os.path.basename(path):
+                os.remove(os.path.join(os.path.dirname(path), file_name))
@@ -1,10 +1,12 @@
-import logging
+import time
 
 import joblib
 import mlflow
 import mlflow.sklearn
 import numpy as np
 import pandas as pd
+from joblib import Parallel, delayed
+from pandas.api.types import union_categoricals
 from mlflow.models.signature import infer_signature
 from sklearn.compose import ColumnTransformer
 from sklearn.ensemble import RandomForestRegressor
@@ -14,37 +16,101 @@ from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import OneHotEncoder
 from sklearn.preprocessing import StandardScaler
 
+from jobs.ml.model_store import WeekModelStore, week_model_key
 from jobs.shared.constants import cat_features, model_prediction_vars, numerical_features
+from jobs.shared.db import get_engine
 from jobs.shared.logging_config import logger
+from jobs.shared.profiling import profiled
 from jobs.shared.settings import settings
 
 
-def read_weekly_stats() -> pd.DataFrame:
-    return pd.read_sql(
-        sql='select * from weekly_stats;',
-        con=settings.POSTGRES_CONN_STRING
-    )
+model_params = {'n_estimators': 100, 'random_state': 42}
+max_historical_years = 3
+
+
+training_cols = list(dict.fromkeys(['season', 'week', 'fantasy_points'] + cat_features + numerical_features +
+                                   model_prediction_vars))
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype({**{col: 'category' for col in cat_features},
+                      **{col: 'float32' for col in ['fantasy_points'] + numerical_features + model_prediction_vars},
+                      'season': 'int32', 'week': 'int32'})
+
+
+def serving_dtypes(X: pd.DataFrame) -> pd.DataFrame:
+    # Categoricals are only for holding the history compactly. The preprocessor has to be fit on object columns with
+    # None for missing, like the frames batch prediction passes it, or its imputer won't treat None as missing
+    X = X.astype({col: object for col in cat_features})
+    X[cat_features] = X[cat_features].where(X[cat_features].notna(), None)
+    return X
+
+
+@profiled
+def read_weekly_stats(min_season: int, max_season: int) -> pd.DataFrame:
+    # Only pull the seasons and columns training uses, streamed through a server side cursor in chunks
+    # that are shrunk to compact dtypes as they arrive
+    cols = ', '.join(training_cols)
+    with get_engine().connect().execution_options(stream_results=True) as conn:
+        chunks = [compact_dtypes(chunk) for chunk in pd.read_sql(
+            sql=f'select {cols} from weekly_stats where season >= {min_season} and season <= {max_season}',
+            con=conn,
+            chunksize=settings.TRAIN_READ_CHUNK_SIZE
+        )]
+
+    if not chunks:
+        return compact_dtypes(pd.DataFrame(columns=training_cols))
+
+    # Chunks each have their own categories, align them so concat keeps the categorical dtype
+    for col in cat_features:
+        categories = union_categoricals([chunk[col] for chunk in chunks], sort_categories=True).categories
+        for chunk in chunks:
+            chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
 
 
 class EnsembleModel:
     def __init__(self, models):
         self.models = models
+        self._compiled = None
+
+    def __getstate__(self):
+        # The compiled form is rebuilt on first predict, no need to ship it with the logged model
+        state = self.__dict__.copy()
+        state['_compiled'] = None
+        return state
 
     def fit(self, X, y, sample_weight=None):
         # The individual models are already fitted, so we don't need to do anything here
         pass
 
-    def predict(self, X):
-        # Make predictions with each model
-        predictions = np.array([model.predict(X) for model in self.models])
-
-        # Calculate weights based on the model's position in the list (more recent models get higher weights)
+    def compile(self):
+        # Flatten every member forest into one weighted forest. A forest predicts the mean of its trees, so the
+        # weighted average over models is each tree's leaf values scaled by model_weight / n_trees, summed
         weights = np.linspace(0.5, 1, len(self.models))
         weights = weights / np.sum(weights)
 
-        # Compute weighted average of predictions
-        weighted_predictions = np.average(predictions, axis=0, weights=weights)
+        self._compiled = []
+        for model, weight in zip(self.models, weights):
+            tree_weight = weight / len(model.estimators_)
+            for estimator in model.estimators_:
+                self._compiled.append((estimator.tree_, estimator.tree_.value[:, :, 0] * tree_weight))
+        return self
 
+    def predict(self, X):
+        if getattr(self, '_compiled', None) is None:
+            self.compile()
+
+        # Validate / convert once for every tree instead of once per forest
+        X = self.models[0]._validate_X_predict(X)
+
+        # Accumulate in place so only one (n_rows, n_outputs) array is ever held
+        weighted_predictions = np.zeros((X.shape[0], self.models[0].n_outputs_), dtype=np.float64)
+        for tree, scaled_values in self._compiled:
+            weighted_predictions += scaled_values[tree.apply(X)]
+
+        if self.models[0].n_outputs_ == 1:
+            return weighted_predictions.ravel()
         return weighted_predictions
 
 
@@ -72,9 +138,67 @@ def exponential_decay(days, decay_rate=0.005):
     return np.exp(-decay_rate * days)
 
 
+def get_week_masks(df: pd.DataFrame, current_season: int, current_week: int, validation_weeks_for_week1: int,
+                   max_historical_years: int):
+    week_masks = []
+    for week in range(1, current_week + 1):
+        if week == 1:
+            train_mask = df['season'] < current_season
+            val_mask = (df['season'] == current_season - 1) & (
+                        df['week'] > df['week'].max() - validation_weeks_for_week1)
+            logger.info(
+                f"Week 1: Training on {max_historical_years} years of data, "
+                f"validating on last {validation_weeks_for_week1} weeks of previous season")
+        else:
+            train_mask = (df['season'] < current_season) | ((df['season'] == current_season) & (df['week'] < week))
+            val_mask = (df['season'] == current_season) & (df['week'] == week)
+        week_masks.append((week, train_mask.to_numpy(), val_mask.to_numpy()))
+    return week_masks
+
+
+def validate_week_model(model, X, y: np.ndarray, val_idx: np.ndarray):
+    if len(val_idx) == 0:
+        return None, None
+    y_pred = model.predict(X[val_idx])
+    return mean_squared_error(y[val_idx], y_pred), mean_absolute_error(y[val_idx], y_pred)
+
+
+def fit_week_model(week: int, X, y: np.ndarray, sample_weights: np.ndarray, train_idx: np.ndarray,
+                   val_idx: np.ndarray):
+    # Runs inside a worker: X, y and sample_weights are shared (memmapped for process workers), only the
+    # row indices differ per task
+    start = time.perf_counter()
+    model = RandomForestRegressor(**model_params)
+    model.fit(X[train_idx], y[train_idx], sample_weight=sample_weights[train_idx])
+    mse, mae = validate_week_model(model, X, y, val_idx)
+    return week, model, mse, mae, time.perf_counter() - start
+
+
+def rows_fingerprint(df: pd.DataFrame, mask: np.ndarray) -> str:
+    # Sample weights are covered by days_since_start: week to week they only change by a constant factor,
+    # which doesn't change the forest
+    cols = ['season', 'week', 'days_since_start'] + cat_features + numerical_features + model_prediction_vars
+    rows = df.loc[mask, cols].sort_values(['season', 'week', 'player_id'])
+    return joblib.hash(pd.util.hash_pandas_object(rows, index=False).to_numpy())
+
+
+@profiled
+def fit_week_models(week_masks, X, y: np.ndarray, sample_weights: np.ndarray, n_jobs: int, backend: str):
+    task_args = [(week, X, y, sample_weights, np.flatnonzero(train_mask), np.flatnonzero(val_mask))
+                 for week, train_mask, val_mask in week_masks]
+    if n_jobs == 1:
+        return [fit_week_model(*args) for args in task_args]
+    # max_nbytes=0 memmaps every array argument so workers read the same preprocessed matrix instead of a pickled copy
+    return Parallel(n_jobs=n_jobs, backend=backend, max_nbytes=0)(delayed(fit_week_model)(*args) for args in task_args)
+
+
+@profiled
 def train_model(df: pd.DataFrame, current_season: int, current_week: int, experiment_name: str,
-                validation_weeks_for_week1: int = 3, max_historical_years: int = 3):
+                validation_weeks_for_week1: int = 3, max_historical_years: int = max_historical_years, n_jobs: int = None,
+                backend: str = None, compare_with_serial: bool = False):
     mlflow.set_experiment(experiment_name)
+    n_jobs = n_jobs if n_jobs is not None else settings.TRAIN_N_JOBS
+    backend = backend if backend is not None else settings.TRAIN_PARALLEL_BACKEND
 
     with mlflow.start_run(run_name=f"Season_{current_season}_Week_{current_week}"):
         models = []
@@ -83,6 +207,8 @@ def train_model(df: pd.DataFrame, current_season: int, current_week: int, experi
         mlflow.log_param("current_season", current_season)
         mlflow.log_param("current_week", current_week)
         mlflow.log_param("max_historical_years", max_historical_years)
+        mlflow.log_param("n_jobs", n_jobs)
+        mlflow.log_param("parallel_backend", backend)
 
         # Sort data by season and week
         df = df.sort_values(by=['season', 'week'])
@@ -98,48 +224,71 @@ def train_model(df: pd.DataFrame, current_season: int, current_week: int, experi
         df['time_weight'] = exponential_decay(max_days - df['days_since_start'])
 
         # Feature engineering for recency
-        df['recent_performance'] = df.groupby('player_id')['fantasy_points'].transform(lambda x: x.ewm(span=5).mean())
+        df['recent_performance'] = df.groupby('player_id', observed=True)['fantasy_points'] \
+                                     .transform(lambda x: x.ewm(span=5).mean())
 
-        X = df[cat_features + numerical_features]
+        X = serving_dtypes(df[cat_features + numerical_features])
         y = df[model_prediction_vars]
 
         preprocessor = create_preprocessor(cat_features, numerical_features)
-        X_preprocessed = preprocessor.fit_transform(X)
+        model_store = WeekModelStore(settings.TRAIN_MODEL_STORE_DIR) if settings.TRAIN_MODEL_STORE_DIR else None
+        history_mask = df['season'] < current_season
+        if model_store is not None and history_mask.any():
+            # Fit on prior seasons only so the feature space (and so every stored week model) stays valid all season
+            preprocessor.fit(X[history_mask])
+            X_preprocessed = preprocessor.transform(X)
+        else:
+            X_preprocessed = preprocessor.fit_transform(X)
+        preprocessor_fingerprint = joblib.hash(preprocessor)
 
         # Create sample weights
         sample_weights = df['time_weight']
-
-        for week in range(1, current_week + 1):
-            if week == 1:
-                train_mask = df['season'] < current_season
-                val_mask = (df['season'] == current_season - 1) & (
-                            df['week'] > df['week'].max() - validation_weeks_for_week1)
-                logger.info(
-                    f"Week 1: Training on {max_historical_years} years of data, "
-                    f"validating on last {validation_weeks_for_week1} weeks of previous season")
-            else:
-                train_mask = (df['season'] < current_season) | ((df['season'] == current_season) & (df['week'] < week))
-                val_mask = (df['season'] == current_season) & (df['week'] == week)
-
-            train_X = X_preprocessed[train_mask]
-            train_y = y[train_mask]
-            train_weights = sample_weights[train_mask]
-
-            val_X = X_preprocessed[val_mask]
-            val_y = y[val_mask]
-
-            if train_X.shape[0] == 0:
+        y_values = y.to_numpy()
+        sample_weight_values = sample_weights.to_numpy()
+
+        week_masks = []
+        cached_results = {}
+        week_keys = {}
+        for week, train_mask, val_mask in get_week_masks(df, current_season, current_week,
+                                                         validation_weeks_for_week1, max_historical_years):
+            if not train_mask.any():
                 logger.error(f"No training data for Season {current_season}, Week {week}")
                 continue
-
-            model = RandomForestRegressor(n_estimators=100, random_state=42)
-            model.fit(train_X, train_y, sample_weight=train_weights)
-
-            if val_X.shape[0] > 0:
-                y_pred = model.predict(val_X)
-                mse = mean_squared_error(val_y, y_pred)
-                mae = mean_absolute_error(val_y, y_pred)
-
+            if model_store is not None:
+                train_fingerprint = joblib.hash((rows_fingerprint(df, train_mask), preprocessor_fingerprint))
+                week_keys[week] = week_model_key(current_season, week, train_fingerprint, model_params)
+                entry = model_store.load(current_season, week, week_keys[week])
+                if entry is not None:
+                    val_fingerprint = rows_fingerprint(df, val_mask)
+                    if entry['val_fingerprint'] != val_fingerprint:
+                        # Model is still valid but its validation week has landed or been corrected since
+                        entry['mse'], entry['mae'] = validate_week_model(entry['model'], X_preprocessed, y_values,
+                                                                         np.flatnonzero(val_mask))
+                        entry['val_fingerprint'] = val_fingerprint
+                        model_store.save(current_season, week, week_keys[week], entry)
+                    cached_results[week] = (week, entry['model'], entry['mse'], entry['mae'], 0.0)
+                    continue
+            week_masks.append((week, train_mask, val_mask))
+
+        logger.info(f"Reusing {len(cached_results)} stored weekly models, training {len(week_masks)}")
+        mlflow.log_metric("reused_week_models", len(cached_results))
+
+        start = time.perf_counter()
+        trained_results = fit_week_models(week_masks, X_preprocessed, y_values, sample_weight_values, n_jobs, backend)
+        train_secs = time.perf_counter() - start
+
+        if model_store is not None:
+            val_masks = {week: val_mask for week, _, val_mask in week_masks}
+            for week, model, mse, mae, _ in trained_results:
+                model_store.save(current_season, week, week_keys[week],
+                                 {'model': model, 'mse': mse, 'mae': mae,
+                                  'val_fingerprint': rows_fingerprint(df, val_masks[week])})
+
+        results = sorted(list(cached_results.values()) + trained_results, key=lambda result: result[0])
+
+        # Results come back in week order regardless of which worker finished first, so logging is deterministic
+        for week, model, mse, mae, _ in results:
+            if mse is not None:
                 mse_scores.append(mse)
                 mae_scores.append(mae)
 
@@ -152,6 +301,25 @@ def train_model(df: pd.DataFrame, current_season: int, current_week: int, experi
 
             models.append(model)
 
+        mlflow.log_metric("train_secs", train_secs)
+        if compare_with_serial and n_jobs != 1:
+            start = time.perf_counter()
+            fit_week_models(week_masks, X_preprocessed, y_values, sample_weight_values, 1, backend)
+            serial_secs = time.perf_counter() - start
+            mlflow.log_metric("serial_train_secs", serial_secs)
+            mlflow.log_metric("train_speedup", serial_secs / train_secs)
+            logger.info(f"Trained {len(trained_results)} weekly models in {train_secs:.1f}s with n_jobs={n_jobs} "
+                        f"({backend}), serial took {serial_secs:.1f}s: {serial_secs / train_secs:.2f}x speedup")
+        elif trained_results:
+            # Serial mode would take about the summed per-week fit time, so this estimates the speedup without
+            # training everything twice. compare_with_serial measures it exactly
+            task_secs = sum(result[-1] for result in trained_results)
+            train_speedup = task_secs / train_secs
+            mlflow.log_metric("train_speedup_estimate", train_speedup)
+            logger.info(f"Trained {len(trained_results)} weekly models in {train_secs:.1f}s with n_jobs={n_jobs} "
+                        f"({backend}), summed per-week fit time {task_secs:.1f}s: ~{train_speedup:.2f}x estimated "
+                        f"speedup over serial")
+
         if not models:
             logger.error("No models were trained. Check your data and filtering conditions.")
             return None, preprocessor
@@ -189,6 +357,7 @@ def train_model(df: pd.DataFrame, current_season: int, current_week: int, experi
         return ensemble_model, preprocessor, mlflow_run_id
 
 
+@profiled
 def register_model_and_preprocessor(mlflow_run_id, season, week):
     tags = {"season": season, "week": week}
     model_result = mlflow.register_model(
@@ -203,10 +372,13 @@ def register_model_and_preprocessor(mlflow_run_id, season, week):
     )
     return model_result, preprocessor_result
 
+@profiled
 def main(season: int, week: int):
     logger.info(f'Running model training for season {season} and week {week}')
     mlflow.set_tracking_uri(settings.MLFLOW_TRACKING_URI)
 
-    df = read_weekly_stats()
-    ensemble_model, preprocessor, run_id = train_model(df, season, week, "ff-prediction-model")
+    df = read_weekly_stats(season - max_historical_years, season)
+    ensemble_model, preprocessor, run_id = train_model(df, season, week, "ff-prediction-model",
+                                                       max_historical_years=max_historical_years)
     _, _ = register_model_and_preprocessor(run_id, season, week)
+    return ensemble_model, preprocessor
@@ -1,15 +1,14 @@
-import os
+from datetime import date
+from typing import Tuple
 
-import httpx
+from jobs.shared.schedule_calendar import get_schedule_calendar
 
-from jobs.shared.logging_config import logger
-from jobs.shared.settings import settings
 
-
-def get_current_season_week():
-    api_base = settings.API_BASE
-    endpoint = os.path.join(api_base, 'api/current-season-week')
-    res = httpx.get(endpoint)
-    if res.status_code == 200:
-        data = res.json()
-        return data['season'], data['week']
+def get_current_season_week(today: date = None) -> Tuple[int, int]:
+    # Resolved from the schedule table directly rather than asking the API for the same answer
+    today = today if today is not None else date.today()
+    season_week = get_schedule_calendar().season_week_on(today)
+    if season_week is None:
+        raise ValueError(f'No scheduled games on or after {today}, run populate_schedule for the next season')
+    season, week = season_week
+    return int(season), int(week)
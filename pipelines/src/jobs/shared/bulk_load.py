@@ -0,0 +1,118 @@
+import io
+import time
+from typing import Dict, List
+
+import polars as pl
+from sqlalchemy import Engine, Integer, column, delete, table, text
+
+from jobs.shared.data_versions import bump_data_versions, season_weeks_written
+from jobs.shared.db import get_engine, get_table
+from jobs.shared.logging_config import logger
+from jobs.shared.profiling import profiled
+
+
+def check_table_exists(table_name: str) -> None:
+    # Tables are owned by the migrations, never inferred from whatever DataFrame happens to be written first
+    if get_table(table_name) is None:
+        raise ValueError(f'Table {table_name} does not exist, run run_migrations.py first')
+
+
+def conform_to_table(df: pl.DataFrame, table_name: str) -> pl.DataFrame:
+    # Whole number stats sometimes arrive as floats, which COPY won't put into an INTEGER column
+    int_cols = [col.name for col in get_table(table_name).columns
+                if isinstance(col.type, Integer) and col.name in df.columns and df[col.name].dtype.is_float()]
+    return df.with_columns(pl.col(int_cols).round().cast(pl.Int64)) if int_cols else df
+
+
+def copy_frame(conn, df: pl.DataFrame, table_name: str) -> None:
+    buffer = io.BytesIO()
+    df.write_csv(buffer, include_header=False, null_value='\\N')
+    buffer.seek(0)
+
+    columns = ', '.join(f'"{col}"' for col in df.columns)
+    cursor = conn.connection.cursor()
+    try:
+        cursor.copy_expert(f'COPY "{table_name}" ({columns}) FROM STDIN WITH (FORMAT csv, NULL \'\\N\')', buffer)
+    finally:
+        cursor.close()
+
+
+def load_frame(conn, df: pl.DataFrame, table_name: str, delete_where: Dict[str, object] = None) -> None:
+    # Deletes the rows matching delete_where (if any), streams df in with COPY and bumps the data version of every
+    # season / week written, on the caller's connection so several tables can be swapped in one transaction
+    check_table_exists(table_name)
+    start = time.perf_counter()
+    if delete_where:
+        target = table(table_name, *[column(col) for col in delete_where])
+        stmt = delete(target).where(*[target.c[col] == value for col, value in delete_where.items()])
+        logger.info(f'Deleting data for {delete_where} from {table_name}')
+        conn.execute(stmt)
+
+    copy_frame(conn, conform_to_table(df, table_name), table_name)
+    bump_data_versions(conn, table_name, season_weeks_written(df, delete_where))
+
+    # Logged here so loads sharing one transaction each still report their own rate
+    secs = time.perf_counter() - start
+    logger.info(f'Loaded {len(df)} rows into {table_name} in {secs:.2f}s ({len(df) / max(secs, 1e-9):.0f} rows/sec)')
+
+
+@profiled
+def bulk_load(df: pl.DataFrame, table_name: str, delete_where: Dict[str, object] = None,
+              engine: Engine = None) -> None:
+    # load_frame in its own transaction, so readers never see the table with the old rows gone and the new ones
+    # missing
+    engine = engine if engine is not None else get_engine()
+    with engine.begin() as conn:
+        load_frame(conn, df, table_name, delete_where)
+
+
+@profiled
+def upsert_frame(df: pl.DataFrame, table_name: str, key_cols: List[str], engine: Engine = None) -> Dict[str, int]:
+    # COPYs df into a temp table and writes only the rows that are new or differ from what's stored, with
+    # ON CONFLICT on key_cols, so a rerun or a stat correction costs time in proportion to what changed. Data
+    # versions are only bumped for the season / weeks that actually changed, when the table has season and week
+    engine = engine if engine is not None else get_engine()
+    check_table_exists(table_name)
+    df = conform_to_table(df, table_name)
+    staging = f'{table_name}_staging'
+    columns = ', '.join(f'"{col}"' for col in df.columns)
+    keys = ', '.join(f'"{col}"' for col in key_cols)
+    value_cols = [col for col in df.columns if col not in key_cols]
+    join_on = ' and '.join(f's."{col}" = t."{col}"' for col in key_cols)
+    changed = ' or '.join(f's."{col}" is distinct from t."{col}"' for col in value_cols)
+    updates = ', '.join(f'"{col}" = excluded."{col}"' for col in value_cols)
+    # Rows are picked deterministically out of repeated keys, so a rerun can't flip which one is kept and report it
+    # as an update
+    pick_order = ', '.join(f'"{col}"' for col in key_cols + value_cols)
+    # Only tables with season / week carry data versions
+    versioned = 'season' in df.columns and 'week' in df.columns
+    returning = 'season, week, (xmax = 0) as inserted' if versioned else '(xmax = 0) as inserted'
+
+    duplicates = len(df) - df.select(key_cols).n_unique()
+    if duplicates:
+        logger.warning(f'{duplicates} rows for {table_name} repeat a key in {key_cols}, keeping one row per key')
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        conn.execute(text(f'create temp table "{staging}" (like "{table_name}") on commit drop'))
+        copy_frame(conn, df, staging)
+        # distinct on so a key repeated within df doesn't make ON CONFLICT touch the same row twice
+        written = conn.execute(text(f'''
+            insert into "{table_name}" ({columns})
+            select {', '.join(f't."{col}"' for col in df.columns)}
+            from (select distinct on ({keys}) * from "{staging}" order by {pick_order}) t
+            left join "{table_name}" s on {join_on}
+            where s."{key_cols[0]}" is null{f' or {changed}' if changed else ''}
+            on conflict ({keys}) do {f'update set {updates}' if updates else 'nothing'}
+            returning {returning}
+        ''')).fetchall()
+        if versioned:
+            bump_data_versions(conn, table_name, {(row.season, row.week) for row in written})
+
+    inserted = sum(1 for row in written if row.inserted)
+    counts = {'inserted': inserted, 'updated': len(written) - inserted,
+              'unchanged': df.select(key_cols).n_unique() - len(written)}
+    secs = time.perf_counter() - start
+    logger.info(f'Upserted {len(df)} rows into {table_name} in {secs:.2f}s: {counts["inserted"]} inserted, '
+                f'{counts["updated"]} updated, {counts["unchanged"]} unchanged')
+    return counts
@@ -1,116 +1,116 @@
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, List
 
-import nfl_data_py as nfl
 import pandas as pd
 import polars as pl
-from sqlalchemy import create_engine, MetaData, Table, delete
 
+from jobs.shared.bulk_load import bulk_load
 from jobs.shared.constants import positions
+from jobs.shared.db import get_engine
 from jobs.shared.logging_config import logger
+from jobs.shared.nfl_cache import scan_nfl_season
+from jobs.shared.profiling import profiled
 from jobs.shared.settings import settings
 
 
-def pull_schedules(season: int, week: int = None) -> pl.DataFrame:
-    df =  pl.from_pandas(nfl.import_schedules([season])) \
+def scan_schedules(season: int, week: int = None) -> pl.LazyFrame:
+    lf = scan_nfl_season('schedules', season) \
             .drop('nfl_detail_id')
     if week is not None:
-        df = df.filter(pl.col('week') == week)
-    return df
+        lf = lf.filter(pl.col('week') == week)
+    return lf
 
 
-def pull_depth_chart(seasons: List[int], week: int) -> pl.DataFrame:
+def scan_depth_chart(seasons: List[int], week: int) -> pl.LazyFrame:
 
     # TODO: temp workaround for week 1 - remove at some point
     if len(seasons) == 1 and seasons[0] == 2024 and week == 1:
-        depth_df = pl.from_pandas(pd.read_sql(
+        depth_lf = pl.from_pandas(pd.read_sql(
             sql=f'select * from depth_chart_tmp where season = {seasons[0]} and week = {week}',
-            con=settings.POSTGRES_CONN_STRING
-        ))
-        depth_df = depth_df.select('season', pl.col('team').alias('club_code'), 'week',
+            con=get_engine()
+        )).lazy()
+        depth_lf = depth_lf.select('season', pl.col('team').alias('club_code'), 'week',
                                    pl.col('player_id').alias('gsis_id'), 'position',
                                    pl.col('depth').alias('depth_ranking'))
     else:
-        depth_df = pl.from_pandas(nfl.import_depth_charts(seasons)) \
-                     .filter(pl.col('position').is_in(positions)) \
-                     .filter(pl.col('position') == pl.col('depth_position')) \
-                     .select('season', 'club_code', 'week', 'depth_team', 'gsis_id', 'position') \
-                     .unique() \
-                     .group_by(['season', 'club_code', 'week', 'gsis_id', 'position']) \
-                     .agg(pl.max('depth_team').cast(pl.Int8).alias('depth_ranking'))
+        depth_lf = fetch_per_season(partial(scan_nfl_season, 'depth_charts'), seasons)
+        # Week filter goes ahead of unique() explicitly, the optimizer won't push a predicate through it
         if week is not None:
-            depth_df = depth_df.filter(pl.col('week') == week)
+            depth_lf = depth_lf.filter(pl.col('week') == week)
+        depth_lf = depth_lf.filter(pl.col('position').is_in(positions)) \
+                           .filter(pl.col('position') == pl.col('depth_position')) \
+                           .select('season', 'club_code', 'week', 'depth_team', 'gsis_id', 'position') \
+                           .unique() \
+                           .group_by(['season', 'club_code', 'week', 'gsis_id', 'position']) \
+                           .agg(pl.max('depth_team').cast(pl.Int8).alias('depth_ranking'))
 
-    return depth_df
+    return depth_lf
 
 
-def pull_roster(seasons: List[int], week: int) -> pl.DataFrame:
-    # Have to pull one week at a time and concat due to bug: https://github.com/nflverse/nfl_data_py/issues/75
-    nfl_df = None
-    for index, season in enumerate(seasons):
-        # Columns' dtypes change throughout time so aligning them all to current version
-        tmp_df = pl.from_pandas(nfl.import_weekly_rosters([season])) \
-                   .with_columns(pl.col('years_exp').cast(pl.Int32)) \
-                   .with_columns(pl.col('entry_year').cast(pl.Int32)) \
-                   .with_columns(pl.col('weight').cast(pl.Float64))
+def fetch_per_season(fetch: Callable[[int], pl.LazyFrame], seasons: List[int]) -> pl.LazyFrame:
+    # Seasons are fetched concurrently on a bounded pool and concatenated once, instead of growing a frame season
+    # by season and re-copying everything already accumulated
+    workers = max(1, min(settings.NFL_FETCH_WORKERS, len(seasons)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(fetch, seasons))
+    return pl.concat(frames, how='vertical_relaxed')
 
-        if index == 0:
-            nfl_df = tmp_df
-        else:
-            nfl_df = pl.concat(items=[nfl_df, tmp_df])
+
+def scan_roster_season(season: int) -> pl.LazyFrame:
+    # Have to pull one season at a time due to bug: https://github.com/nflverse/nfl_data_py/issues/75
+    # Columns' dtypes change throughout time so aligning them all to current version
+    return scan_nfl_season('weekly_rosters', season) \
+             .with_columns(pl.col('years_exp').cast(pl.Int32)) \
+             .with_columns(pl.col('entry_year').cast(pl.Int32)) \
+             .with_columns(pl.col('weight').cast(pl.Float64))
+
+
+def scan_roster(seasons: List[int], week: int) -> pl.LazyFrame:
+    nfl_lf = fetch_per_season(scan_roster_season, seasons)
 
     if week is not None:
-        nfl_df = nfl_df.filter(pl.col('week') == week)
+        nfl_lf = nfl_lf.filter(pl.col('week') == week)
 
-        if len(nfl_df) == 0:
+        # Only reads the week column, so this doesn't materialize the roster
+        if nfl_lf.select(pl.len()).collect().item() == 0:
             raise ValueError(f'No weekly roster data found for season {seasons} and week {week}')
 
-    return nfl_df
+    return nfl_lf
 
 
-def pull_schedule(seasons: List[int], week: int) -> pl.DataFrame:
-    schedule_df = None
-    for index, season in enumerate(seasons):
-        tmp_df = pull_schedules(season, week)
-        if index == 0:
-            schedule_df = tmp_df
-        else:
-            schedule_df = pl.concat(items=[schedule_df, tmp_df])
+def scan_schedule(seasons: List[int], week: int) -> pl.LazyFrame:
+    schedule_lf = fetch_per_season(scan_schedules, seasons)
 
     if week is not None:
-        schedule_df = schedule_df.filter(pl.col('week') == week)
+        schedule_lf = schedule_lf.filter(pl.col('week') == week)
 
-    return schedule_df
+    return schedule_lf
 
 
-def pull_stats_agg(seasons: List[int], week: int = None) -> pl.DataFrame:
-    nfl_df = pl.from_pandas(nfl.import_weekly_data(seasons))
+@profiled
+def pull_schedule(seasons: List[int], week: int) -> pl.DataFrame:
+    return scan_schedule(seasons, week).collect()
+
+
+def scan_stats_agg(seasons: List[int], week: int = None) -> pl.LazyFrame:
+    nfl_lf = fetch_per_season(partial(scan_nfl_season, 'weekly_data'), seasons)
     if week is not None:
-        nfl_df = nfl_df.filter(pl.col('week') == week)
-    return nfl_df
+        nfl_lf = nfl_lf.filter(pl.col('week') == week)
+    return nfl_lf
+
+
+@profiled
+def collect_streaming(plan: pl.LazyFrame, name: str) -> pl.DataFrame:
+    # Streaming engine runs the optimized plan in batches instead of materializing every intermediate frame
+    if settings.LOG_QUERY_PLANS:
+        logger.info(f'Optimized plan for {name}:\n{plan.explain(streaming=True)}')
+    return plan.collect(streaming=True)
 
 
+@profiled
 def upsert_to_db(df: pl.DataFrame, table_name: str, season: int, week: int) -> None:
     # Have to delete data for the season / week then insert
     # otherwise, someone who was injured will remain in the predictions from old data
-    engine = create_engine(settings.POSTGRES_CONN_STRING)
-    metadata = MetaData()
-    table = Table(table_name, metadata, autoload_with=engine)
-
-    with engine.begin() as conn:
-        stmt = (
-            delete(table)
-            .where(
-                (table.c.season == season) &
-                (table.c.week == week)
-            )
-        )
-
-        logger.info(f'Deleting data for season {season} and week {week} from {table_name}')
-        conn.execute(stmt)
-
-    logger.info(f'Inserting data for season {season} and week {week} to {table_name}')
-    df.write_database(
-        table_name=table_name,
-        connection=settings.POSTGRES_CONN_STRING,
-        if_table_exists='append'
-    )
\ No newline at end of file
+    logger.info(f'Upserting data for season {season} and week {week} to {table_name}')
+    bulk_load(df, table_name, delete_where={'season': season, 'week': week})
@@ -0,0 +1,28 @@
+from typing import Dict, Iterable, Set, Tuple
+
+import polars as pl
+from sqlalchemy import text
+
+# Lets the API tell when a season / week of a table has been rewritten without looking at the rows themselves
+
+_bump_stmt = text('''
+    insert into data_versions (table_name, season, week, version, updated_at)
+    values (:table_name, :season, :week, 1, now())
+    on conflict (table_name, season, week)
+    do update set version = data_versions.version + 1, updated_at = now()
+''')
+
+def season_weeks_written(df: pl.DataFrame, delete_where: Dict[str, object] = None) -> Set[Tuple[int, int]]:
+    season_weeks = set()
+    if 'season' in df.columns and 'week' in df.columns:
+        season_weeks.update(df.select('season', 'week').unique().iter_rows())
+    if delete_where and 'season' in delete_where and 'week' in delete_where:
+        season_weeks.add((delete_where['season'], delete_where['week']))
+    return season_weeks
+
+
+def bump_data_versions(conn, table_name: str, season_weeks: Iterable[Tuple[int, int]]) -> None:
+    params = [{'table_name': table_name, 'season': int(season), 'week': int(week)}
+              for season, week in sorted(season_weeks) if season is not None and week is not None]
+    if params:
+        conn.execute(_bump_stmt, params)
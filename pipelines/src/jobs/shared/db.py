@@ -0,0 +1,54 @@
+from typing import Dict, Optional
+
+from sqlalchemy import Engine, MetaData, Table, create_engine, event
+from sqlalchemy.exc import NoSuchTableError
+
+from jobs.shared.logging_config import logger
+from jobs.shared.settings import settings
+
+_engine: Optional[Engine] = None
+_metadata = MetaData()
+_tables: Dict[str, Optional[Table]] = {}
+
+connection_stats = {'opened': 0, 'checkouts': 0}
+
+
+def _on_connect(dbapi_connection, connection_record):
+    connection_stats['opened'] += 1
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    connection_stats['checkouts'] += 1
+
+
+def get_engine() -> Engine:
+    # One pooled engine per process, shared by every reader and writer
+    global _engine
+    if _engine is None:
+        _engine = create_engine(settings.POSTGRES_CONN_STRING, pool_size=settings.DB_POOL_SIZE, pool_pre_ping=True)
+        event.listen(_engine, 'connect', _on_connect)
+        event.listen(_engine, 'checkout', _on_checkout)
+    return _engine
+
+
+def get_table(table_name: str) -> Optional[Table]:
+    # Reflects each table once per process, None if it doesn't exist
+    if table_name not in _tables:
+        try:
+            _tables[table_name] = Table(table_name, _metadata, autoload_with=get_engine())
+        except NoSuchTableError:
+            _tables[table_name] = None
+    return _tables[table_name]
+
+
+def invalidate_tables() -> None:
+    # Forgets every reflected table so the next get_table sees the schema as it is now
+    _tables.clear()
+    _metadata.clear()
+
+
+def log_connection_stats() -> None:
+    opened = connection_stats['opened']
+    checkouts = connection_stats['checkouts']
+    logger.info(f'DB connections: {opened} opened, {checkouts - opened} reused ({checkouts} checkouts), '
+                f'{len(_tables)} tables reflected')
@@ -0,0 +1,65 @@
+import os
+import re
+from typing import List, Tuple
+
+from sqlalchemy import Engine, text
+
+from jobs.shared.db import get_engine, invalidate_tables
+from jobs.shared.logging_config import logger
+
+# Numbered .sql files owning every table's DDL, applied once each in order and recorded in schema_migrations
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'migrations')
+
+# Arbitrary key for pg_advisory_xact_lock so two jobs starting together don't both apply the same migration
+_migrations_lock_id = 730_412
+
+_create_migrations_table = text('''
+    create table if not exists schema_migrations (
+        version int primary key,
+        name varchar not null,
+        applied_at timestamptz not null default now()
+    )
+''')
+
+_record_migration = text('insert into schema_migrations (version, name) values (:version, :name)')
+
+
+def list_migrations() -> List[Tuple[int, str, str]]:
+    migrations = []
+    for file_name in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = re.fullmatch(r'(\d+)_(\w+)\.sql', file_name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, file_name)))
+    return migrations
+
+
+def apply_migrations(engine: Engine = None) -> List[int]:
+    # Applies every pending migration in a single transaction, so a failure leaves the schema as it was
+    engine = engine if engine is not None else get_engine()
+    applied_now = []
+    with engine.begin() as conn:
+        conn.execute(text('select pg_advisory_xact_lock(:lock_id)'), {'lock_id': _migrations_lock_id})
+        conn.execute(_create_migrations_table)
+        applied = set(conn.execute(text('select version from schema_migrations')).scalars())
+
+        for version, name, path in list_migrations():
+            if version in applied:
+                continue
+            logger.info(f'Applying migration {version:04d}_{name}')
+            with open(path) as f:
+                sql = f.read()
+            # Straight to the driver so the migration's own % and : characters aren't read as bind parameters
+            cursor = conn.connection.cursor()
+            try:
+                cursor.execute(sql)
+            finally:
+                cursor.close()
+            conn.execute(_record_migration, {'version': version, 'name': name})
+            applied_now.append(version)
+
+    if not applied_now:
+        logger.info('Database schema is up to date')
+    else:
+        # Any table reflected before now may have been created, altered or dropped
+        invalidate_tables()
+    return applied_now
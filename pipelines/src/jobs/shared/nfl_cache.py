@@ -0,0 +1,103 @@
+import datetime
+import os
+import time
+from importlib.metadata import version
+from typing import Callable, List, Optional, Tuple
+
+import nfl_data_py as nfl
+import pandas as pd
+import polars as pl
+
+from jobs.shared.logging_config import logger
+from jobs.shared.profiling import profile_step
+from jobs.shared.settings import settings
+
+
+importers = {
+    'schedules': nfl.import_schedules,
+    'depth_charts': nfl.import_depth_charts,
+    'weekly_rosters': nfl.import_weekly_rosters,
+    'weekly_data': nfl.import_weekly_data,
+}
+
+nfl_data_version = version('nfl_data_py')
+
+
+def current_nfl_season(today: datetime.date = None) -> int:
+    # Seasons start in September and finish in February of the next year
+    today = today or datetime.date.today()
+    return today.year if today.month >= 3 else today.year - 1
+
+
+def season_end(season: int) -> datetime.datetime:
+    # Matches current_nfl_season, which rolls over on March 1
+    return datetime.datetime(season + 1, 3, 1)
+
+
+def cache_ttl_secs(dataset: str, season: int, cached_at: datetime.datetime) -> Optional[int]:
+    # Completed seasons never change, so a copy written after the season ended never expires. One written while it
+    # was still going (playoffs, late stat corrections) expires after its dataset's TTL
+    if cached_at >= season_end(season):
+        return None
+    return settings.NFL_CACHE_TTL_SECS.get(dataset, settings.NFL_CACHE_CURRENT_SEASON_TTL_SECS)
+
+
+def cache_path(dataset: str, season: int) -> str:
+    # Versioned by the nfl_data_py release, so a library upgrade that changes the data shape reads into a fresh
+    # directory rather than serving files written by the old one
+    return os.path.join(settings.NFL_CACHE_DIR, dataset, nfl_data_version, f'{season}.parquet')
+
+
+def is_fresh(path: str, dataset: str, season: int) -> bool:
+    mtime = os.path.getmtime(path)
+    ttl = cache_ttl_secs(dataset, season, datetime.datetime.fromtimestamp(mtime))
+    return ttl is None or time.time() - mtime < ttl
+
+
+def cached_path(dataset: str, season: int) -> Optional[str]:
+    # Path of a cached copy that can be served, offline mode serves whatever is there however old
+    path = cache_path(dataset, season)
+    if os.path.exists(path) and (settings.NFL_DATA_OFFLINE or is_fresh(path, dataset, season)):
+        logger.info(f'nfl_data cache hit for {dataset} season {season}')
+        return path
+    return None
+
+
+def import_season(dataset: str, season: int,
+                  importer: Callable[[List[int]], pd.DataFrame]) -> Tuple[pd.DataFrame, bool]:
+    # Downloads the season and writes it to the cache, returning the frame and whether the cache write went through
+    if settings.NFL_DATA_OFFLINE:
+        raise ValueError(f'nfl_data offline mode and no cached {dataset} for season {season}')
+
+    logger.info(f'nfl_data cache miss for {dataset} season {season}, downloading')
+    with profile_step('nfl_cache.import_season') as record:
+        df = importer([season])
+        record.rows_out = len(df)
+
+    path = cache_path(dataset, season)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f'Could not cache {dataset} season {season}: {e}')
+        return df, False
+    return df, True
+
+
+def scan_nfl_season(dataset: str, season: int) -> pl.LazyFrame:
+    # Scans the cached parquet so a plan only reads the columns and row groups it needs
+    importer = importers[dataset]
+    if not settings.NFL_CACHE_DIR:
+        return pl.from_pandas(importer([season])).lazy()
+
+    path = cached_path(dataset, season)
+    if path is not None:
+        return pl.scan_parquet(path)
+
+    df, cached = import_season(dataset, season, importer)
+    if not cached:
+        # Couldn't be cached, plan over the downloaded copy instead
+        return pl.from_pandas(df).lazy()
+    return pl.scan_parquet(cache_path(dataset, season))
@@ -1,4 +1,33 @@
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
 from jobs.shared.points_config import PointsConfig
+from jobs.shared.profiling import profiled
+
+
+# (stat column, per-unit points attribute on PointsConfig)
+per_unit_points = [('passing_yards', 'pp_qb_yd'),
+                   ('passing_tds', 'pp_qb_td'),
+                   ('interceptions', 'pp_int'),
+                   ('receptions', 'pp_rec'),
+                   ('receiving_yards', 'pp_rec_yd'),
+                   ('receiving_tds', 'pp_rec_td'),
+                   ('rushing_yards', 'pp_rush_yd'),
+                   ('rushing_tds', 'pp_rush_td'),
+                   ('fumbles', 'pp_fumble'),
+                   ('rushing_2pt_conversions', 'pp_rushing_2pt_conversions'),
+                   ('receiving_2pt_conversions', 'pp_receiving_2pt_conversions'),
+                   ('passing_2pt_conversions', 'pp_passing_2pt_conversions')]
+
+# (stat column, threshold attribute, bonus points attribute on PointsConfig)
+yardage_bonuses = [('passing_yards', 'qb_yd_bonus_thresh', 'pp_qb_yd_bonus'),
+                   ('receiving_yards', 'rec_bonus_thresh', 'pp_rec_bonus'),
+                   ('rushing_yards', 'rush_bonus_thresh', 'pp_rush_bonus')]
+
+scoring_cols = [col for col, _ in per_unit_points]
 
 
 def calculate_fantasy_points(pc: PointsConfig, qb_yd, qb_td, int, rec, rec_yd, rec_td, rush_yd, rush_td, fumble,
@@ -20,4 +49,35 @@ def calculate_fantasy_points(pc: PointsConfig, qb_yd, qb_td, int, rec, rec_yd, r
     passing_2pt_conversion_pts = passing_2pt_conversions * pc.pp_passing_2pt_conversions
     return (qb_yd_bonus_pts + qb_yd_pts + qb_td_pts + int_pts + rec_pts + rec_yd_bonus_pts + rec_yd_pts + rec_td_pts +
             rush_yd_bonus_pts + rush_yd_pts + rush_td_pts + fumble_pts + rushing_2pt_conversion_pts +
-            receiving_2pt_converstion_pts + passing_2pt_conversion_pts)
\ No newline at end of file
+            receiving_2pt_converstion_pts + passing_2pt_conversion_pts)
+
+
+def fantasy_points_expr(pc: PointsConfig) -> pl.Expr:
+    # Same scoring as calculate_fantasy_points but as a native polars expression so it never leaves rust
+    terms = [pl.col(col).cast(pl.Float64) * getattr(pc, attr) for col, attr in per_unit_points]
+    for col, thresh_attr, bonus_attr in yardage_bonuses:
+        thresh = getattr(pc, thresh_attr)
+        if thresh is not None:
+            terms.append(pl.when(pl.col(col) >= thresh)
+                           .then(pl.lit(getattr(pc, bonus_attr), dtype=pl.Float64))
+                           .otherwise(pl.lit(0.0)))
+    return pl.sum_horizontal(terms)
+
+
+def calculate_fantasy_points_np(pc: PointsConfig, df: pd.DataFrame) -> np.ndarray:
+    # NumPy path for pandas callers
+    points = np.zeros(len(df), dtype=np.float64)
+    for col, attr in per_unit_points:
+        points += df[col].to_numpy(dtype=np.float64) * getattr(pc, attr)
+    for col, thresh_attr, bonus_attr in yardage_bonuses:
+        thresh = getattr(pc, thresh_attr)
+        if thresh is not None:
+            points += np.where(df[col].to_numpy(dtype=np.float64) >= thresh, getattr(pc, bonus_attr), 0)
+    return points
+
+
+@profiled
+def score_configs(df: pl.DataFrame, configs: Dict[str, PointsConfig], keys: List[str] = None) -> pl.DataFrame:
+    # Scores every config in a single pass over df, one output column per config name
+    keys = keys if keys is not None else ['player_id', 'season', 'week']
+    return df.select(*keys, *[fantasy_points_expr(pc).alias(name) for name, pc in configs.items()])
@@ -0,0 +1,181 @@
+import cProfile
+import functools
+import os
+import resource
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import insert, text
+
+from jobs.shared.db import get_engine, get_table
+from jobs.shared.logging_config import logger
+from jobs.shared.settings import settings
+
+# A step this many times slower than in the job's previous successful run gets logged as a regression
+regression_ratio = 1.5
+regression_min_secs = 1.0
+
+
+class PipelineRun:
+    def __init__(self, job_name: str, season: Optional[int], week: Optional[int]):
+        self.run_id = uuid.uuid4()
+        self.job_name = job_name
+        self.season = season
+        self.week = week
+        self.steps = []
+        self._next_step_id = 0
+        self._lock = threading.Lock()
+
+    def next_step_id(self) -> int:
+        # Steps run on the stage graph and fetch pools too, not only the main thread
+        with self._lock:
+            step_id = self._next_step_id
+            self._next_step_id += 1
+            return step_id
+
+
+class StepRecord:
+    def __init__(self, step_id: int, step: str, rows_in: Optional[int]):
+        self.step_id = step_id
+        self.step = step
+        self.rows_in = rows_in
+        self.rows_out = None
+
+
+_current_run: Optional[PipelineRun] = None
+# Ids of the steps open on each thread, innermost last, so nested steps know their parent
+_open_steps = threading.local()
+
+
+def frame_rows(value) -> Optional[int]:
+    # Frames report their row count, models and other values don't have one
+    shape = getattr(value, 'shape', None)
+    return shape[0] if shape else None
+
+
+def peak_rss_mb() -> float:
+    # High-water mark of the whole process so far, ru_maxrss is in KB on linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def dump_profile(profiler: cProfile.Profile, run: PipelineRun, record: StepRecord) -> None:
+    profile_dir = os.path.join(settings.PROFILE_DIR, f'{run.job_name}_{run.run_id}')
+    os.makedirs(profile_dir, exist_ok=True)
+    path = os.path.join(profile_dir, f'{record.step_id:03d}_{record.step}.prof')
+    profiler.dump_stats(path)
+    logger.info(f'Wrote profile of {record.step} to {path}')
+
+
+@contextmanager
+def profile_step(step: str, rows_in: Optional[int] = None):
+    # Records wall time, CPU time, rows and peak RSS for the block against the active pipeline run. CPU time and
+    # RSS are process wide, so they include polars' own threads and any step running alongside this one.
+    run = _current_run
+    if run is None:
+        yield StepRecord(-1, step, rows_in)
+        return
+
+    open_steps = getattr(_open_steps, 'ids', None)
+    if open_steps is None:
+        open_steps = _open_steps.ids = []
+    record = StepRecord(run.next_step_id(), step, rows_in)
+    parent_step_id = open_steps[-1] if open_steps else (None if record.step_id == 0 else 0)
+
+    # Outermost step on each thread gets the cProfile dump, a thread can only have one profiler running
+    profiler = cProfile.Profile() if settings.PROFILE_DIR and not open_steps else None
+    open_steps.append(record.step_id)
+    started_at = datetime.now(timezone.utc)
+    rss_before = peak_rss_mb()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    if profiler is not None:
+        profiler.enable()
+
+    status = 'failed'
+    try:
+        yield record
+        status = 'ok'
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        wall_secs, cpu_secs = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        open_steps.pop()
+        rss_after = peak_rss_mb()
+        with run._lock:
+            run.steps.append({'run_id': run.run_id, 'job_name': run.job_name, 'season': run.season,
+                              'week': run.week, 'step_id': record.step_id, 'parent_step_id': parent_step_id,
+                              'step': step, 'status': status, 'started_at': started_at, 'wall_secs': wall_secs,
+                              'cpu_secs': cpu_secs, 'rows_in': record.rows_in, 'rows_out': record.rows_out,
+                              'peak_rss_mb': rss_after, 'rss_growth_mb': rss_after - rss_before})
+        if profiler is not None:
+            dump_profile(profiler, run, record)
+
+
+def profiled(func):
+    # Decorator form of profile_step, named module.function. Rows in are summed over the frames passed in, rows out
+    # are taken from the return value when it's a frame
+    step = f'{func.__module__.rsplit(".", 1)[-1]}.{func.__name__}'
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if _current_run is None:
+            return func(*args, **kwargs)
+
+        input_rows = [rows for rows in map(frame_rows, [*args, *kwargs.values()]) if rows is not None]
+        with profile_step(step, sum(input_rows) if input_rows else None) as record:
+            result = func(*args, **kwargs)
+            record.rows_out = frame_rows(result)
+            return result
+    return wrapper
+
+
+def log_regressions(conn, run: PipelineRun) -> None:
+    previous = conn.execute(text('''
+        select step, sum(wall_secs) as wall_secs
+        from pipeline_runs
+        where run_id = (select run_id from pipeline_runs
+                        where job_name = :job_name and step_id = 0 and status = 'ok' and run_id != :run_id
+                        order by started_at desc limit 1)
+        group by step
+    '''), {'job_name': run.job_name, 'run_id': run.run_id})
+    previous_secs = {row.step: row.wall_secs for row in previous}
+
+    current_secs = {}
+    for step in run.steps:
+        current_secs[step['step']] = current_secs.get(step['step'], 0.0) + step['wall_secs']
+    for step, secs in current_secs.items():
+        before = previous_secs.get(step)
+        if before is not None and secs > before * regression_ratio and secs - before > regression_min_secs:
+            logger.warning(f'{step} took {secs:.1f}s, up from {before:.1f}s in the previous {run.job_name} run')
+
+
+def save_run(run: PipelineRun) -> None:
+    # Never lets a profiling problem hide how the job itself went
+    try:
+        table = get_table('pipeline_runs')
+        if table is None:
+            logger.warning('pipeline_runs table missing, run run_migrations.py to record pipeline profiles')
+            return
+        with get_engine().begin() as conn:
+            conn.execute(insert(table), run.steps)
+            log_regressions(conn, run)
+        logger.info(f'Recorded {len(run.steps)} profiled steps for {run.job_name} run {run.run_id}')
+    except Exception as e:
+        logger.warning(f'Could not record pipeline run {run.run_id}: {e}')
+
+
+@contextmanager
+def pipeline_run(job_name: str, season: int = None, week: int = None):
+    # Profiled steps inside the block are recorded under one run id, with the block itself as step 0
+    global _current_run
+    run = PipelineRun(job_name, season, week)
+    _current_run = run
+    try:
+        with profile_step(job_name):
+            yield run
+    finally:
+        _current_run = None
+        save_run(run)
@@ -0,0 +1,37 @@
+import bisect
+from datetime import date
+from typing import Iterable, Optional, Tuple
+
+import pandas as pd
+
+from jobs.shared.db import get_engine
+
+
+class ScheduleCalendar:
+    # Mirror of the API's calendar: every game day in the schedule table, resolved to a season / week by binary search
+    def __init__(self, games: Iterable[Tuple[date, int, int]] = ()):
+        games = sorted(games)
+        self._gamedays = [gameday for gameday, _, _ in games]
+        self._season_weeks = [(season, week) for _, season, week in games]
+
+    def season_week_on(self, day: date) -> Optional[Tuple[int, int]]:
+        # Season / week of the first game on or after day, None once the last loaded season is over
+        i = bisect.bisect_left(self._gamedays, day)
+        return self._season_weeks[i] if i < len(self._gamedays) else None
+
+
+_calendar: Optional[ScheduleCalendar] = None
+
+
+def get_schedule_calendar() -> ScheduleCalendar:
+    # Read once per process, populate_schedule drops it after rewriting the schedule
+    global _calendar
+    if _calendar is None:
+        df = pd.read_sql(sql='select gameday, season, week from schedule', con=get_engine())
+        _calendar = ScheduleCalendar(zip(pd.to_datetime(df['gameday']).dt.date, df['season'], df['week']))
+    return _calendar
+
+
+def invalidate_schedule_calendar() -> None:
+    global _calendar
+    _calendar = None
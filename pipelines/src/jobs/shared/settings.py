@@ -2,6 +2,8 @@ from pydantic_settings import BaseSettings
 
 
 import os
+from typing import Dict
+
 from dotenv import load_dotenv
 
 if os.path.exists(".env.local"):
@@ -15,8 +17,27 @@ class Settings(BaseSettings):
     POSTGRES_CONN_STRING: str
     FF_PREDICTION_MODEL_NAME: str
     FF_PREDICTION_PREPROCESSOR_NAME: str
-    API_BASE: str
     MLFLOW_TRACKING_URI: str
+    TRAIN_N_JOBS: int = 1
+    TRAIN_PARALLEL_BACKEND: str = 'loky'
+    # Opt-in reuse of weekly models across runs. Its preprocessor is fit on prior seasons only, so current-season
+    # players outside that history don't get their own one-hot column, and it only pays off on a mounted volume
+    TRAIN_MODEL_STORE_DIR: str = ''
+    NFL_CACHE_DIR: str = 'artifacts/nfl_data'
+    NFL_CACHE_CURRENT_SEASON_TTL_SECS: int = 3600
+    # Per-dataset overrides of the TTL above for seasons still in progress, as JSON in the env var. Schedules only
+    # move for flexed games, the rest picks up injuries, depth chart moves and stat corrections through the week
+    NFL_CACHE_TTL_SECS: Dict[str, int] = {'schedules': 24 * 3600}
+    NFL_DATA_OFFLINE: bool = False
+    NFL_FETCH_WORKERS: int = 4
+    LOG_QUERY_PLANS: bool = False
+    PIPELINE_STAGE_WORKERS: int = 2
+    PROFILE_DIR: str = ''
+    DB_POOL_SIZE: int = 5
+    TRAIN_READ_CHUNK_SIZE: int = 50000
+    MODEL_CACHE_DIR: str = 'artifacts/model_cache'
+    MODEL_CACHE_MAX_BYTES: int = 2 * 1024 ** 3
+    MODEL_CACHE_IN_PROCESS: bool = False
 
     class Config:
         env_file = ".env.local" if os.path.exists(".env.local") else ".env"
@@ -0,0 +1,86 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from jobs.shared.logging_config import logger
+from jobs.shared.profiling import frame_rows, profile_step
+
+
+class Stage(NamedTuple):
+    name: str
+    # Called with the output of every stage named in inputs as a keyword argument, what it returns is this stage's
+    # output. Writing to the database stays the stage's own business.
+    run: Callable[..., object]
+    inputs: Tuple[str, ...] = ()
+
+
+class StageReport(NamedTuple):
+    name: str
+    started_secs: float
+    secs: float
+    rows: Optional[int]
+
+
+def check_stages(stages: List[Stage]) -> None:
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f'Duplicate stage names in {names}')
+
+    for stage in stages:
+        unknown = [name for name in stage.inputs if name not in names]
+        if unknown:
+            raise ValueError(f'Stage {stage.name} depends on unknown stages {unknown}')
+
+    # Anything left once nothing more can be resolved is part of a cycle
+    resolved, remaining = set(), list(stages)
+    while remaining:
+        ready = [stage for stage in remaining if all(name in resolved for name in stage.inputs)]
+        if not ready:
+            raise ValueError(f'Stages {[stage.name for stage in remaining]} form a dependency cycle')
+        resolved.update(stage.name for stage in ready)
+        remaining = [stage for stage in remaining if stage.name not in resolved]
+
+
+def run_stage(stage: Stage, inputs: Dict[str, object], run_start: float) -> Tuple[object, StageReport]:
+    logger.info(f'Starting stage {stage.name}')
+    input_rows = [rows for rows in map(frame_rows, inputs.values()) if rows is not None]
+    start = time.perf_counter()
+    try:
+        with profile_step(f'stage.{stage.name}', sum(input_rows) if input_rows else None) as record:
+            output = stage.run(**inputs)
+            record.rows_out = frame_rows(output)
+    except Exception:
+        logger.error(f'Stage {stage.name} failed after {time.perf_counter() - start:.1f}s')
+        raise
+    return output, StageReport(stage.name, start - run_start, time.perf_counter() - start, frame_rows(output))
+
+
+def log_report(reports: List[StageReport], total_secs: float) -> None:
+    logger.info(f'Ran {len(reports)} stages in {total_secs:.1f}s')
+    for report in sorted(reports, key=lambda r: r.started_secs):
+        rows = report.rows if report.rows is not None else '-'
+        logger.info(f'  {report.name:<24} started {report.started_secs:7.1f}s  took {report.secs:7.1f}s  rows {rows}')
+
+
+def run_stages(stages: List[Stage], max_workers: int) -> Dict[str, object]:
+    # Each stage starts as soon as the stages it reads from finish, so independent stages run side by side, and
+    # outputs are handed over in memory rather than re-read from the database
+    check_stages(stages)
+    outputs, reports = {}, []
+    pending, running = list(stages), {}
+    run_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        while pending or running:
+            for stage in [stage for stage in pending if all(name in outputs for name in stage.inputs)]:
+                pending.remove(stage)
+                inputs = {name: outputs[name] for name in stage.inputs}
+                running[pool.submit(run_stage, stage, inputs, run_start)] = stage
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                outputs[stage.name], report = future.result()
+                reports.append(report)
+
+    log_report(reports, time.perf_counter() - run_start)
+    return outputs
@@ -0,0 +1,221 @@
+-- Every table the pipelines write to and the API reads from. Keys lead with (season, week) because that is what
+-- nearly every read filters on. IF NOT EXISTS so databases created by the old auto-create path can be adopted,
+-- 0002 then adds the keys those tables are missing.
+
+CREATE TABLE IF NOT EXISTS weekly_stats (
+    player_id VARCHAR NOT NULL,
+    player_display_name VARCHAR,
+    position VARCHAR,
+    headshot_url VARCHAR,
+    team VARCHAR,
+    season INT NOT NULL,
+    week INT NOT NULL,
+    opponent VARCHAR,
+    home_away VARCHAR,
+    age REAL,
+    completions INT,
+    attempts INT,
+    passing_yards REAL,
+    passing_tds INT,
+    interceptions REAL,
+    fumbles REAL,
+    sacks REAL,
+    sack_yards REAL,
+    passing_air_yards REAL,
+    passing_yards_after_catch REAL,
+    passing_first_downs REAL,
+    passing_epa REAL,
+    passing_2pt_conversions INT,
+    pacr REAL,
+    dakota REAL,
+    carries INT,
+    rushing_yards REAL,
+    rushing_tds INT,
+    rushing_first_downs REAL,
+    rushing_epa REAL,
+    rushing_2pt_conversions INT,
+    receptions INT,
+    targets INT,
+    receiving_yards REAL,
+    receiving_tds INT,
+    receiving_air_yards REAL,
+    receiving_yards_after_catch REAL,
+    receiving_first_downs REAL,
+    receiving_epa REAL,
+    receiving_2pt_conversions INT,
+    racr REAL,
+    target_share REAL,
+    air_yards_share REAL,
+    wopr REAL,
+    special_teams_tds REAL,
+    depth_ranking INT,
+    fantasy_points REAL,
+    fantasy_points_ppr REAL,
+    PRIMARY KEY (season, week, player_id)
+);
+
+CREATE TABLE IF NOT EXISTS weekly_roster (
+    season INT NOT NULL,
+    week INT NOT NULL,
+    position VARCHAR NOT NULL,
+    status VARCHAR NOT NULL,
+    player_id VARCHAR NOT NULL,
+    player_name VARCHAR NOT NULL,
+    age REAL,
+    team VARCHAR NOT NULL,
+    opponent VARCHAR,
+    home_away VARCHAR NOT NULL,
+    depth_ranking INT NOT NULL,
+    PRIMARY KEY (season, week, player_id)
+);
+
+CREATE TABLE IF NOT EXISTS weekly_predictions_base (
+    player_id VARCHAR(255) NOT NULL,
+    passing_yards FLOAT8,
+    passing_tds FLOAT8,
+    interceptions FLOAT8,
+    fumbles FLOAT8,
+    rushing_yards FLOAT8,
+    rushing_tds FLOAT8,
+    rushing_2pt_conversions FLOAT8,
+    receptions FLOAT8,
+    receiving_yards FLOAT8,
+    receiving_tds FLOAT8,
+    receiving_2pt_conversions FLOAT8,
+    passing_2pt_conversions FLOAT8,
+    season INT NOT NULL,
+    week INT NOT NULL,
+    player_name VARCHAR(255),
+    team VARCHAR(3),
+    opponent VARCHAR(3),
+    position VARCHAR(3),
+    PRIMARY KEY (season, week, player_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_weekly_predictions_base_position ON weekly_predictions_base (season, week, position);
+CREATE INDEX IF NOT EXISTS ix_weekly_predictions_base_team ON weekly_predictions_base (season, week, team);
+
+CREATE TABLE IF NOT EXISTS weekly_fantasy_points (
+    season INT NOT NULL,
+    week INT NOT NULL,
+    scoring_format VARCHAR NOT NULL,
+    player_id VARCHAR(255) NOT NULL,
+    fantasy_points FLOAT8,
+    PRIMARY KEY (season, week, scoring_format, player_id)
+);
+
+-- Matches the ranked predictions order and the (fantasy_points, player_id) keyset cursor, rebuilt in case an older
+-- definition without player_id is in place
+DROP INDEX IF EXISTS ix_weekly_fantasy_points_ranked;
+CREATE INDEX ix_weekly_fantasy_points_ranked
+    ON weekly_fantasy_points (season, week, scoring_format, fantasy_points DESC, player_id DESC);
+
+CREATE TABLE IF NOT EXISTS prediction_diffs (
+    player_id VARCHAR(255) NOT NULL,
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    player_name VARCHAR,
+    team VARCHAR(5),
+    opponent VARCHAR(5),
+    position VARCHAR(5),
+    fantasy_points DOUBLE PRECISION,
+    passing_yards DOUBLE PRECISION,
+    passing_tds DOUBLE PRECISION,
+    interceptions DOUBLE PRECISION,
+    fumbles DOUBLE PRECISION,
+    rushing_yards DOUBLE PRECISION,
+    rushing_tds DOUBLE PRECISION,
+    rushing_2pt_conversions DOUBLE PRECISION,
+    receptions DOUBLE PRECISION,
+    receiving_yards DOUBLE PRECISION,
+    receiving_tds DOUBLE PRECISION,
+    receiving_2pt_conversions DOUBLE PRECISION,
+    passing_2pt_conversions DOUBLE PRECISION,
+    fantasy_points_actual DOUBLE PRECISION,
+    passing_yards_actual DOUBLE PRECISION,
+    passing_tds_actual INTEGER,
+    interceptions_actual DOUBLE PRECISION,
+    fumbles_actual DOUBLE PRECISION,
+    rushing_yards_actual DOUBLE PRECISION,
+    rushing_tds_actual INTEGER,
+    rushing_2pt_conversions_actual INTEGER,
+    receptions_actual INTEGER,
+    receiving_yards_actual DOUBLE PRECISION,
+    receiving_tds_actual INTEGER,
+    receiving_2pt_conversions_actual INTEGER,
+    passing_2pt_conversions_actual INTEGER,
+    fantasy_points_diff DOUBLE PRECISION,
+    passing_yards_diff DOUBLE PRECISION,
+    passing_tds_diff DOUBLE PRECISION,
+    interceptions_diff DOUBLE PRECISION,
+    fumbles_diff DOUBLE PRECISION,
+    rushing_yards_diff DOUBLE PRECISION,
+    rushing_tds_diff DOUBLE PRECISION,
+    rushing_2pt_conversions_diff DOUBLE PRECISION,
+    receptions_diff DOUBLE PRECISION,
+    receiving_yards_diff DOUBLE PRECISION,
+    receiving_tds_diff DOUBLE PRECISION,
+    receiving_2pt_conversions_diff DOUBLE PRECISION,
+    passing_2pt_conversions_diff DOUBLE PRECISION,
+    PRIMARY KEY (season, week, player_id)
+);
+
+-- Ranked diffs page, optionally narrowed to one position, in (fantasy_points, player_id) keyset order
+CREATE INDEX IF NOT EXISTS ix_prediction_diffs_ranked
+    ON prediction_diffs (season, week, fantasy_points DESC, player_id DESC);
+CREATE INDEX IF NOT EXISTS ix_prediction_diffs_position
+    ON prediction_diffs (season, week, position, fantasy_points DESC, player_id DESC);
+
+CREATE TABLE IF NOT EXISTS accuracy_metrics (
+    season INTEGER NOT NULL,
+    week INTEGER NOT NULL,
+    "MAE" DOUBLE PRECISION,
+    "MSE" DOUBLE PRECISION,
+    "RMSE" DOUBLE PRECISION,
+    "R_squared" DOUBLE PRECISION,
+    PRIMARY KEY (season, week)
+);
+
+CREATE TABLE IF NOT EXISTS schedule (
+    game_id VARCHAR NOT NULL,
+    season INT NOT NULL,
+    week INT NOT NULL,
+    gameday DATE NOT NULL,
+    gametime TIME,
+    weekday VARCHAR,
+    home_team VARCHAR NOT NULL,
+    away_team VARCHAR NOT NULL,
+    PRIMARY KEY (game_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_schedule_season_week ON schedule (season, week);
+-- Current season / week lookup is "first game on or after today"
+CREATE INDEX IF NOT EXISTS ix_schedule_gameday ON schedule (gameday);
+
+CREATE TABLE IF NOT EXISTS data_versions (
+    table_name VARCHAR NOT NULL,
+    season INT NOT NULL,
+    week INT NOT NULL,
+    version BIGINT NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (table_name, season, week)
+);
+
+CREATE TABLE IF NOT EXISTS stadium_details (
+    stadium_id VARCHAR(10) NOT NULL,
+    stadium_name VARCHAR(255),
+    home_team VARCHAR(3),
+    type VARCHAR(20),
+    PRIMARY KEY (stadium_id)
+);
+
+CREATE TABLE IF NOT EXISTS depth_chart_tmp (
+    team VARCHAR(5),
+    player_name VARCHAR,
+    position VARCHAR(5),
+    depth INT,
+    player_id VARCHAR NOT NULL,
+    season INT NOT NULL,
+    week INT NOT NULL,
+    PRIMARY KEY (season, week, player_id)
+);
@@ -0,0 +1,30 @@
+-- Tables that were auto-created from a DataFrame before the pipelines had migrations have no keys at all. Drop any
+-- duplicate rows those unkeyed appends left behind, then add the primary key and the (season, week) lookup index.
+DO $$
+DECLARE
+    t RECORD;
+BEGIN
+    FOR t IN SELECT * FROM (VALUES
+        ('weekly_stats', 'season, week, player_id'),
+        ('weekly_roster', 'season, week, player_id'),
+        ('weekly_predictions_base', 'season, week, player_id'),
+        ('prediction_diffs', 'season, week, player_id'),
+        ('accuracy_metrics', 'season, week')
+    ) AS keys (table_name, key_columns)
+    LOOP
+        IF NOT EXISTS (SELECT 1 FROM pg_constraint
+                       WHERE conrelid = t.table_name::regclass AND contype = 'p') THEN
+            RAISE NOTICE 'Adding primary key (%) to %', t.key_columns, t.table_name;
+            EXECUTE format('DELETE FROM %I a USING %I b WHERE a.ctid < b.ctid AND (%s) = (%s)',
+                           t.table_name, t.table_name,
+                           regexp_replace(t.key_columns, '(\w+)', 'a.\1', 'g'),
+                           regexp_replace(t.key_columns, '(\w+)', 'b.\1', 'g'));
+            EXECUTE format('ALTER TABLE %I ADD PRIMARY KEY (%s)', t.table_name, t.key_columns);
+        END IF;
+    END LOOP;
+
+    IF NOT EXISTS (SELECT 1 FROM pg_constraint WHERE conrelid = 'schedule'::regclass AND contype = 'p') THEN
+        DELETE FROM schedule a USING schedule b WHERE a.ctid < b.ctid AND a.game_id = b.game_id;
+        ALTER TABLE schedule ADD PRIMARY KEY (game_id);
+    END IF;
+END $$;
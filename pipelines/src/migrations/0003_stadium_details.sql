@@ -0,0 +1,31 @@
+-- Reference data joined onto the weekly roster to tell dome games from open air ones
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('CHI98', 'Soldier Field', 'CHI', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('SEA00', 'Lumen Field', 'SEA', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('WAS00', 'FedExField', 'WAS', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('BAL00', 'M&T Bank Stadium', 'BAL', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('CAR00', 'Bank of America Stadium', 'CAR', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('IND00', 'Lucas Oil Stadium', 'IND', 'dome') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('GNB00', 'Lambeau Field', 'GNB', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('NOR00', 'Mercedes-Benz Superdome', 'NOR', 'dome') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('MIA00', 'Hard Rock Stadium', 'MIA', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('CIN00', 'Paycor Stadium', 'CIN', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('DET00', 'Ford Field', 'DET', 'dome') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('TAM00', 'Raymond James Stadium', 'TAM', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('NAS00', 'Nissan Stadium', 'NAS', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('JAX00', 'TIAA Bank Stadium', 'JAX', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('LAX01', 'SoFi Stadium', 'LAX', 'dome') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('BOS00', 'Gillette Stadium', 'BOS', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('ATL97', 'Mercedes-Benz Stadium', 'ATL', 'dome') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('KAN00', 'GEHA Field at Arrowhead Stadium', 'KAN', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('MIN01', 'U.S. Bank Stadium', 'MIN', 'dome') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('DAL00', 'AT&T Stadium', 'DAL', 'dome') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('PHI00', 'Lincoln Financial Field', 'PHI', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('SFO01', 'Levi''s Stadium', 'SFO', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('HOU00', 'NRG Stadium', 'HOU', 'dome') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('PIT00', 'Acrisure Stadium', 'PIT', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('CLE00', 'FirstEnergy Stadium', 'CLE', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('BUF00', 'New Era Field', 'BUF', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('DEN00', 'Empower Field at Mile High', 'DEN', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('VEG00', 'Allegiant Stadium', 'VEG', 'dome') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('NYC01', 'MetLife Stadium', 'NYC', 'open') ON CONFLICT (stadium_id) DO NOTHING;
+INSERT INTO stadium_details (stadium_id, stadium_name, home_team, type) VALUES ('PHO00', 'State Farm Stadium', 'PHO', 'dome') ON CONFLICT (stadium_id) DO NOTHING;
@@ -0,0 +1,22 @@
+-- Copies the old per scoring format tables into weekly_fantasy_points where a database still has them
+DO $$
+BEGIN
+    IF to_regclass('weekly_predictions_std_half_ppr') IS NOT NULL THEN
+        INSERT INTO weekly_fantasy_points (season, week, scoring_format, player_id, fantasy_points)
+        SELECT season, week, 'half_ppr', player_id, fantasy_points FROM weekly_predictions_std_half_ppr
+        ON CONFLICT (season, week, scoring_format, player_id) DO NOTHING;
+    END IF;
+    IF to_regclass('weekly_predictions_std_full_ppr') IS NOT NULL THEN
+        INSERT INTO weekly_fantasy_points (season, week, scoring_format, player_id, fantasy_points)
+        SELECT season, week, 'full_ppr', player_id, fantasy_points FROM weekly_predictions_std_full_ppr
+        ON CONFLICT (season, week, scoring_format, player_id) DO NOTHING;
+    END IF;
+    IF to_regclass('weekly_predictions_dk_dfs') IS NOT NULL THEN
+        INSERT INTO weekly_fantasy_points (season, week, scoring_format, player_id, fantasy_points)
+        SELECT season, week, 'dk_dfs', player_id, fantasy_points FROM weekly_predictions_dk_dfs
+        ON CONFLICT (season, week, scoring_format, player_id) DO NOTHING;
+    END IF;
+END $$;
+
+-- Once the API is serving from weekly_fantasy_points the old tables can go:
+-- DROP TABLE weekly_predictions_std_half_ppr, weekly_predictions_std_full_ppr, weekly_predictions_dk_dfs;
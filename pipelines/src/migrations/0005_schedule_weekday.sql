@@ -0,0 +1,9 @@
+-- create_schedule.sql named the column weekdate while populate_schedule has always written weekday
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM information_schema.columns WHERE table_name = 'schedule' AND column_name = 'weekdate')
+       AND NOT EXISTS (SELECT 1 FROM information_schema.columns
+                       WHERE table_name = 'schedule' AND column_name = 'weekday') THEN
+        ALTER TABLE schedule RENAME COLUMN weekdate TO weekday;
+    END IF;
+END $$;
@@ -0,0 +1,18 @@
+-- Maintained by weekly_accuracy alongside prediction_diffs, one row per completed week with its accuracy metrics
+CREATE TABLE IF NOT EXISTS completed_weeks (
+    season INT NOT NULL,
+    week INT NOT NULL,
+    player_count INT NOT NULL,
+    computed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    "MAE" DOUBLE PRECISION,
+    "MSE" DOUBLE PRECISION,
+    "RMSE" DOUBLE PRECISION,
+    "R_squared" DOUBLE PRECISION,
+    PRIMARY KEY (season, week)
+);
+
+INSERT INTO completed_weeks (season, week, player_count, "MAE", "MSE", "RMSE", "R_squared")
+SELECT d.season, d.week, d.player_count, m."MAE", m."MSE", m."RMSE", m."R_squared"
+FROM (SELECT season, week, count(*) AS player_count FROM prediction_diffs GROUP BY season, week) d
+LEFT JOIN accuracy_metrics m ON m.season = d.season AND m.week = d.week
+ON CONFLICT (season, week) DO NOTHING;
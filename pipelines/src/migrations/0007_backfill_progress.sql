@@ -0,0 +1,8 @@
+-- Seasons a historical backfill has fully written, so a failed run can resume after the last one
+CREATE TABLE IF NOT EXISTS backfill_progress (
+    job_name VARCHAR NOT NULL,
+    season INT NOT NULL,
+    row_count INT NOT NULL,
+    completed_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (job_name, season)
+);
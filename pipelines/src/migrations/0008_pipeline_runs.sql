@@ -0,0 +1,22 @@
+-- One row per profiled step of a pipeline run, step 0 being the run as a whole, so a slow week can be pinned on a
+-- step and compared against earlier runs of the same job
+CREATE TABLE IF NOT EXISTS pipeline_runs (
+    run_id UUID NOT NULL,
+    job_name VARCHAR NOT NULL,
+    season INT,
+    week INT,
+    step_id INT NOT NULL,
+    parent_step_id INT,
+    step VARCHAR NOT NULL,
+    status VARCHAR NOT NULL,
+    started_at TIMESTAMPTZ NOT NULL,
+    wall_secs DOUBLE PRECISION NOT NULL,
+    cpu_secs DOUBLE PRECISION NOT NULL,
+    rows_in BIGINT,
+    rows_out BIGINT,
+    peak_rss_mb DOUBLE PRECISION NOT NULL,
+    rss_growth_mb DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (run_id, step_id)
+);
+
+CREATE INDEX IF NOT EXISTS ix_pipeline_runs_job_step ON pipeline_runs (job_name, step, started_at);
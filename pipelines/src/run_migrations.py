@@ -0,0 +1,7 @@
+from jobs.shared.migrations import apply_migrations
+from jobs.shared.logging_config import logger
+
+
+if __name__ == '__main__':
+    logger.info('Running database migrations')
+    apply_migrations()
@@ -3,7 +3,12 @@ import argparse
 from jobs.data_pulls import weekly_roster_pull
 from jobs.ml import train_prediction_model, batch_prediction, create_fantasy_points_default_configs
 from jobs.shared.api_utils import get_current_season_week
+from jobs.shared.db import log_connection_stats
+from jobs.shared.migrations import apply_migrations
 from jobs.shared.logging_config import logger
+from jobs.shared.profiling import pipeline_run
+from jobs.shared.settings import settings
+from jobs.shared.stage_graph import Stage, run_stages
 
 
 def parse_args():
@@ -29,12 +34,26 @@ if __name__ == '__main__':
         week = args.week
         logger.info(f'Overriding season/week...')
     else:
-        logger.info(f'Calling api to get latest season/week...')
+        logger.info(f'Resolving latest season/week from the schedule...')
         season, week = get_current_season_week()
 
     logger.info(f'Running ML prediction pipeline for season: {season} and week {week}')
 
-    weekly_roster_pull.main(season=season, week=week)
-    train_prediction_model.main(season=season, week=week)
-    batch_prediction.main(season=season, week=week)
-    create_fantasy_points_default_configs.main(season=season, week=week)
+    apply_migrations()
+
+    with pipeline_run('ml_pipeline', season, week):
+        # Roster pull and training don't depend on each other and run side by side, later stages get their inputs in
+        # memory instead of reading back what was just written
+        run_stages([
+            Stage('roster', lambda: weekly_roster_pull.main(season=season, week=week)),
+            Stage('model', lambda: train_prediction_model.main(season=season, week=week)),
+            Stage('predictions',
+                  lambda roster, model: batch_prediction.main(season=season, week=week, roster_df=roster,
+                                                              model=model[0], preprocessor=model[1]),
+                  inputs=('roster', 'model')),
+            Stage('fantasy_points',
+                  lambda predictions: create_fantasy_points_default_configs.main(season=season, week=week,
+                                                                                 predictions_df=predictions),
+                  inputs=('predictions',)),
+        ], max_workers=settings.PIPELINE_STAGE_WORKERS)
+    log_connection_stats()
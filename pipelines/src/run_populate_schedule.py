@@ -1,6 +1,9 @@
 import argparse
 
 from jobs.data_pulls import populate_schedule
+from jobs.shared.db import log_connection_stats
+from jobs.shared.migrations import apply_migrations
+from jobs.shared.profiling import pipeline_run
 
 
 def parse_args():
@@ -13,4 +16,7 @@ if __name__ == '__main__':
     args = parse_args()
     season = args.season
     print(f'Running populate schedule for season {season}')
-    populate_schedule.main(season)
+    apply_migrations()
+    with pipeline_run('populate_schedule', season):
+        populate_schedule.main(season)
+    log_connection_stats()
@@ -1,11 +1,15 @@
 import argparse
 
-from jobs.data_pulls import weekly_stats_pull
+from jobs.data_pulls import stats_backfill
+from jobs.shared.db import log_connection_stats
+from jobs.shared.migrations import apply_migrations
+from jobs.shared.profiling import pipeline_run
 
 
 def parse_args():
     parser = argparse.ArgumentParser()
     parser.add_argument('seasons', type=int, nargs='+')
+    parser.add_argument('--restart', action='store_true', help='Re-pull seasons an earlier backfill already finished')
     return parser.parse_args()
 
 
@@ -16,5 +20,7 @@ if __name__ == '__main__':
     args = parse_args()
     seasons = args.seasons
     print(f'Running historical stats pull for seasons {seasons}')
-    week = None
-    weekly_stats_pull.main(seasons, week)
+    apply_migrations()
+    with pipeline_run('stats_pull_history'):
+        stats_backfill.main(seasons, restart=args.restart)
+    log_connection_stats()
@@ -1,7 +1,10 @@
 from jobs.data_pulls import weekly_stats_pull, weekly_accuracy
 import argparse
 
+from jobs.shared.db import log_connection_stats
+from jobs.shared.migrations import apply_migrations
 from jobs.shared.logging_config import logger
+from jobs.shared.profiling import pipeline_run
 
 
 def parse_args():
@@ -16,5 +19,8 @@ if __name__ == '__main__':
     season = args.season
     week = args.week
     logger.info(f'Running weekly stats pull for season: {season} and week: {week}')
-    weekly_stats_pull.main([season], week)
-    weekly_accuracy.main(season, week)
+    apply_migrations()
+    with pipeline_run('stats_pull_weekly', season, week):
+        weekly_stats_pull.main([season], week)
+        weekly_accuracy.main(season, week)
+    log_connection_stats()
@@ -1,49 +0,0 @@
-CREATE TABLE prediction_diffs (
-    player_id VARCHAR(255),
-    season INTEGER,
-    week INTEGER,
-    player_name VARCHAR,
-    team VARCHAR(5),
-    opponent VARCHAR(5),
-    position VARCHAR(5),
-    fantasy_points DOUBLE PRECISION,
-    passing_yards DOUBLE PRECISION,
-    passing_tds DOUBLE PRECISION,
-    interceptions DOUBLE PRECISION,
-    fumbles DOUBLE PRECISION,
-    rushing_yards DOUBLE PRECISION,
-    rushing_tds DOUBLE PRECISION,
-    rushing_2pt_conversions DOUBLE PRECISION,
-    receptions DOUBLE PRECISION,
-    receiving_yards DOUBLE PRECISION,
-    receiving_tds DOUBLE PRECISION,
-    receiving_2pt_conversions DOUBLE PRECISION,
-    passing_2pt_conversions DOUBLE PRECISION,
-    fantasy_points_actual DOUBLE PRECISION,
-    passing_yards_actual DOUBLE PRECISION,
-    passing_tds_actual INTEGER,
-    interceptions_actual DOUBLE PRECISION,
-    fumbles_actual DOUBLE PRECISION,
-    rushing_yards_actual DOUBLE PRECISION,
-    rushing_tds_actual INTEGER,
-    rushing_2pt_conversions_actual INTEGER,
-    receptions_actual INTEGER,
-    receiving_yards_actual DOUBLE PRECISION,
-    receiving_tds_actual INTEGER,
-    receiving_2pt_conversions_actual INTEGER,
-    passing_2pt_conversions_actual INTEGER,
-    fantasy_points_diff DOUBLE PRECISION,
-    passing_yards_diff DOUBLE PRECISION,
-    passing_tds_diff DOUBLE PRECISION,
-    interceptions_diff DOUBLE PRECISION,
-    fumbles_diff DOUBLE PRECISION,
-    rushing_yards_diff DOUBLE PRECISION,
-    rushing_tds_diff DOUBLE PRECISION,
-    rushing_2pt_conversions_diff DOUBLE PRECISION,
-    receptions_diff DOUBLE PRECISION,
-    receiving_yards_diff DOUBLE PRECISION,
-    receiving_tds_diff DOUBLE PRECISION,
-    receiving_2pt_conversions_diff DOUBLE PRECISION,
-    passing_2pt_conversions_diff DOUBLE PRECISION,
-    PRIMARY KEY (player_id, season, week)
-);
\ No newline at end of file
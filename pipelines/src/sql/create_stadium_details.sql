@@ -1,7 +0,0 @@
-CREATE TABLE stadium_details (
-    stadium_id VARCHAR(10),
-    stadium_name VARCHAR(255),
-    home_team VARCHAR(3),
-    type VARCHAR(20),
-    PRIMARY KEY (stadium_id)
-);
\ No newline at end of file